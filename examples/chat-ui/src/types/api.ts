@@ -58,6 +58,7 @@ export interface ThreadMetadata {
   created_at: string;
   last_activity: string;
   states: Record<MessageState, number>;
+  last_message_id?: string | null;
 }
 
 export interface ThreadMessagesResponse {
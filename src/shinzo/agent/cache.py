@@ -0,0 +1,65 @@
+"""In-memory cache of agent responses for identical conversations."""
+
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Sequence, Tuple
+
+
+def make_cache_key(
+    model: str, system_prompt: Optional[str], messages: Sequence[Tuple[str, str]]
+) -> Hashable:
+    """
+    Build the cache key for a conversation.
+
+    A response is only reused when the model, the system prompt and every
+    turn of the conversation (including the new user message) are identical.
+
+    Args:
+        model: Model identifier
+        system_prompt: Configured system prompt, if any
+        messages: Conversation history as (role, content) tuples
+
+    Returns:
+        Hashable key for the conversation
+    """
+    return (model, system_prompt, tuple(messages))
+
+
+class ResponseCache:
+    """
+    Least-recently-used cache of agent results keyed by conversation.
+
+    Entries expire after ttl_seconds so answers built from live tool data
+    (such as market prices) are not served indefinitely; 0 never expires.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float = 0):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        # Each entry is (expires_at on the monotonic clock or None, result)
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], str]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached result for a conversation, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, result = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: Hashable, result: str) -> None:
+        """Store a result, evicting the least recently used entry when full."""
+        expires_at = time.monotonic() + self._ttl_seconds if self._ttl_seconds > 0 else None
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
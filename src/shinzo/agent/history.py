@@ -2,8 +2,9 @@
 
 from typing import List, Tuple
 
-from shinzo.models import QueuedMessage, MessageState
+from shinzo.models import QueuedMessage
 from shinzo.queue import QueueManager
+from shinzo.config import settings
 from shinzo.utils import get_logger
 
 
@@ -23,32 +24,52 @@ async def build_conversation_history(
     Returns:
         List of (role, content) tuples representing conversation history
     """
-    messages = []
-
-    if message.thread_id:
-        # Get all previous messages in the thread (chronologically)
-        thread_messages = await queue_manager.get_thread_messages(message.thread_id)
-
-        # Add previous messages to conversation history
-        for prev_msg in thread_messages:
-            # Skip the current message (it will be added last)
-            if prev_msg.id == message.id:
-                continue
-
-            # Add user message
-            messages.append(("user", prev_msg.user_message))
-
-            # Add assistant response if completed
-            if prev_msg.result and prev_msg.state == MessageState.COMPLETED:
-                messages.append(("assistant", prev_msg.result))
+    if not message.thread_id:
+        # Single-turn message: no thread to read, the prompt is the whole history
+        return [("user", message.user_message)]
+
+    # Every other message in the thread, with results of completed ones;
+    # the current message is skipped here and added last
+    messages = await queue_manager.get_conversation_history(
+        message.thread_id, exclude_message_id=message.id
+    )
+    messages = apply_history_window(messages, settings.history_window_turns)
 
     # Add current user message last
     messages.append(("user", message.user_message))
 
     logger.info(
-        f"Built conversation history with {len(messages)} messages "
-        f"(thread_id={message.thread_id})"
+        "Built conversation history with {} messages (thread_id={})",
+        len(messages),
+        message.thread_id,
     )
 
     return messages
 
+
+def apply_history_window(
+    messages: List[Tuple[str, str]], max_turns: int
+) -> List[Tuple[str, str]]:
+    """
+    Keep only the most recent exchanges of a conversation.
+
+    An exchange is a user message and, if it has one, the assistant reply, so
+    the window always starts on a user turn.
+
+    Args:
+        messages: Conversation history as (role, content) tuples
+        max_turns: Number of exchanges to keep (0 keeps everything)
+
+    Returns:
+        The trailing window of the history
+    """
+    if max_turns <= 0:
+        return messages
+
+    seen = 0
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index][0] == "user":
+            seen += 1
+            if seen == max_turns:
+                return messages[index:]
+    return messages
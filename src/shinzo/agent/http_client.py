@@ -0,0 +1,71 @@
+"""Shared HTTP client for LLM provider connections."""
+
+from typing import Optional
+
+import httpx
+
+from shinzo.config import settings
+from shinzo.utils import get_logger
+
+
+logger = get_logger(__name__)
+
+# Providers whose chat models are built on the OpenAI SDK and accept an httpx client
+OPENAI_COMPATIBLE_PROVIDERS = {"openai", "xai"}
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP client, creating it on first use.
+
+    Reusing one pooled client keeps TLS connections to the provider alive
+    between requests and lets concurrent streams share HTTP/2 connections.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+            ),
+            timeout=httpx.Timeout(
+                settings.processing_timeout,
+                connect=settings.http_connect_timeout,
+            ),
+        )
+        logger.info(
+            f"HTTP client created: max_connections={settings.http_max_connections}"
+        )
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release pooled connections."""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("HTTP client closed")
+
+
+def supports_shared_client(model: str) -> bool:
+    """
+    Check whether a model string targets an OpenAI-compatible provider.
+
+    Args:
+        model: Model identifier in "provider:model" form
+
+    Returns:
+        True if the chat model accepts an injected httpx client
+    """
+    provider, _, _ = model.partition(":")
+    return provider in OPENAI_COMPATIBLE_PROVIDERS
@@ -1,8 +1,12 @@
 """Agent initialization logic for creating LangGraph agents."""
 
+from typing import Optional, Sequence
+
 from langchain.chat_models import init_chat_model
+from langchain_core.messages import SystemMessage
 from langgraph.prebuilt import create_react_agent
 
+from shinzo.agent.http_client import get_http_client, supports_shared_client
 from shinzo.config import settings
 from shinzo.tools import get_company_info
 from shinzo.utils import get_logger
@@ -10,31 +14,83 @@ from shinzo.utils import get_logger
 
 logger = get_logger(__name__)
 
+# Tools available to the agent when none are specified
+DEFAULT_TOOLS = (get_company_info,)
+
+# Providers that only cache prompt prefixes marked with cache_control
+EXPLICIT_CACHE_PROVIDERS = {"anthropic"}
+
+
+def build_system_prompt(model: str) -> Optional[SystemMessage]:
+    """
+    Build the static system prompt that leads every conversation.
+
+    The prompt is created once per agent and never reformatted, so it is a
+    byte-identical prefix on every turn. Providers with automatic prefix
+    caching reuse it as-is; for providers that need an explicit marker the
+    prompt is flagged as a cache breakpoint.
+
+    Args:
+        model: Model identifier in "provider:model" form
+
+    Returns:
+        SystemMessage, or None if no system prompt is configured
+    """
+    if not settings.system_prompt:
+        return None
+
+    provider, _, _ = model.partition(":")
+    if provider in EXPLICIT_CACHE_PROVIDERS:
+        return SystemMessage(
+            content=[
+                {
+                    "type": "text",
+                    "text": settings.system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+        )
+    return SystemMessage(content=settings.system_prompt)
 
-def create_agent():
+
+def create_agent(model: Optional[str] = None, tools: Optional[Sequence] = None):
     """
     Initialize and create a LangGraph agent with LLM and tools.
 
+    Args:
+        model: Model identifier in "provider:model" form (defaults to settings.model)
+        tools: Tools to bind to the agent (defaults to DEFAULT_TOOLS)
+
     Returns:
         Initialized LangGraph agent
 
     Raises:
         Exception: If agent initialization fails
     """
+    model = model or settings.model
+    tools = DEFAULT_TOOLS if tools is None else tools
+
     try:
+        # Reuse pooled provider connections where the chat model supports it
+        client_kwargs = {}
+        if supports_shared_client(model):
+            client_kwargs["http_async_client"] = get_http_client()
+
         # Initialize the LLM
         llm = init_chat_model(
-            model=settings.model,
+            model=model,
             streaming=True,
+            **client_kwargs,
         )
 
         # Create agent with tools
         agent = create_react_agent(
             model=llm,
-            tools=[get_company_info],
+            tools=list(tools),
+            prompt=build_system_prompt(model),
         )
 
-        logger.info(f"Agent initialized with model: {settings.model}")
+        logger.info(f"Agent initialized with model: {model}")
         return agent
 
     except Exception as e:
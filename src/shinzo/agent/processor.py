@@ -1,12 +1,15 @@
 """Main AgentProcessor class for processing messages with LangGraph agents."""
 
 import asyncio
-from typing import AsyncGenerator
+import io
+from typing import Any, AsyncGenerator, Dict, Optional, Sequence, Tuple
 
 from shinzo.models import QueuedMessage, MessageState
 from shinzo.queue import QueueManager
 from shinzo.config import settings
 from shinzo.agent import initialization, streaming
+from shinzo.agent.cache import ResponseCache, make_cache_key
+from shinzo.agent.history import build_conversation_history
 from shinzo.utils import get_logger
 
 
@@ -19,11 +22,45 @@ class AgentProcessor:
     def __init__(self, queue_manager: QueueManager):
         self.queue_manager = queue_manager
         self.agent = None
+        self._agent_cache: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+        # Optional cache of results for conversations seen before
+        self._response_cache: Optional[ResponseCache] = (
+            ResponseCache(settings.response_cache_size, settings.response_cache_ttl_seconds)
+            if settings.response_cache_size > 0
+            else None
+        )
         self._initialize_agent()
 
     def _initialize_agent(self):
-        """Initialize the LangGraph agent"""
-        self.agent = initialization.create_agent()
+        """Initialize the default LangGraph agent"""
+        self.agent = self.get_agent()
+
+    def get_agent(
+        self, model: Optional[str] = None, tools: Optional[Sequence] = None
+    ):
+        """
+        Get a compiled agent for a model and tool set, building it on first use
+
+        Compiling the LangGraph graph is expensive, so agents are cached per
+        model and tool names and reused across messages.
+
+        Args:
+            model: Model identifier (defaults to settings.model)
+            tools: Tools to bind (defaults to the standard tool set)
+
+        Returns:
+            Compiled LangGraph agent
+        """
+        model = model or settings.model
+        tools = initialization.DEFAULT_TOOLS if tools is None else tuple(tools)
+        key = (model, tuple(tool.name for tool in tools))
+
+        agent = self._agent_cache.get(key)
+        if agent is None:
+            agent = initialization.create_agent(model=model, tools=tools)
+            self._agent_cache[key] = agent
+
+        return agent
 
     async def process_message(self, message: QueuedMessage) -> None:
         """
@@ -32,7 +69,7 @@ class AgentProcessor:
         Args:
             message: The QueuedMessage to process
         """
-        logger.info(f"Starting to process message: id={message.id}")
+        logger.info("Starting to process message: id={}", message.id)
 
         try:
             # Update state to processing
@@ -44,25 +81,28 @@ class AgentProcessor:
                 timeout=settings.processing_timeout,
             )
 
-            # Store result and mark as completed
-            await self.queue_manager.set_result(message.id, result)
-            await self.queue_manager.update_state(message.id, MessageState.COMPLETED)
+            # Store result and mark as completed in a single update
+            await self.queue_manager.complete(message.id, result)
 
             logger.info(
-                f"Message processed successfully: id={message.id}, "
-                f"result_length={len(result)}"
+                "Message processed successfully: id={}, result_length={}",
+                message.id,
+                len(result),
             )
 
         except asyncio.TimeoutError:
             error_msg = f"Processing timeout after {settings.processing_timeout}s"
-            logger.error(f"Message processing timeout: id={message.id}")
+            logger.error("Message processing timeout: id={}", message.id)
             await self.queue_manager.update_state(
                 message.id, MessageState.FAILED, error=error_msg
             )
 
         except Exception as e:
             error_msg = f"Agent error: {str(e)}"
-            logger.error(f"Message processing error: id={message.id}, error={e}", exc_info=True)
+            logger.error("Message processing error: id={}, error={}", message.id, e)
+            # Agent failures come in bursts during provider outages, so the
+            # traceback is only formatted when debug logging is enabled
+            logger.opt(exception=e).debug("Message processing traceback: id={}", message.id)
             await self.queue_manager.update_state(
                 message.id, MessageState.FAILED, error=error_msg
             )
@@ -77,24 +117,44 @@ class AgentProcessor:
         Returns:
             The complete agent response
         """
-        chunks = []
+        buffer = io.StringIO()
+        written = 0  # Characters generated so far
+        published = 0  # Characters already handed to the queue manager
+
+        history = await build_conversation_history(message, self.queue_manager)
+
+        cache_key = None
+        if self._response_cache is not None:
+            cache_key = make_cache_key(settings.model, settings.system_prompt, history)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Response cache hit: id={}", message.id)
+                if self.queue_manager.has_subscribers(message.id):
+                    await self.queue_manager.add_chunk(message.id, cached)
+                return cached
+
+        # Invoke agent with streaming
+        async for chunk in streaming.stream_agent_response(
+            self.get_agent(), message, self.queue_manager, messages=history
+        ):
+            buffer.write(chunk)
+            written += len(chunk)
 
-        try:
-            # Invoke agent with streaming
-            async for chunk in streaming.stream_agent_response(
-                self.agent, message, self.queue_manager
-            ):
-                chunks.append(chunk)
-                # Store chunk in message for streaming to clients
-                await self.queue_manager.add_chunk(message.id, chunk)
-
-            # Combine all chunks into final result
-            result = "".join(chunks)
-            return result
+            # Only store chunks for streaming when a client is listening
+            if not self.queue_manager.has_subscribers(message.id):
+                continue
 
-        except Exception as e:
-            logger.error(f"Agent invocation error: {e}", exc_info=True)
-            raise
+            if published < written - len(chunk):
+                # A subscriber attached mid-stream: catch it up in one chunk
+                chunk = buffer.getvalue()[published:]
+            await self.queue_manager.add_chunk(message.id, chunk)
+            published = written
+
+        # Materialize the final result once
+        result = buffer.getvalue()
+        if cache_key is not None:
+            self._response_cache.put(cache_key, result)
+        return result
 
     async def _stream_agent(self, message: QueuedMessage) -> AsyncGenerator[str, None]:
         """
@@ -107,7 +167,7 @@ class AgentProcessor:
             Chunks of the agent response
         """
         async for chunk in streaming.stream_agent_response(
-            self.agent, message, self.queue_manager
+            self.get_agent(), message, self.queue_manager
         ):
             yield chunk
 
@@ -126,29 +186,27 @@ class AgentProcessor:
         Yields:
             Chunks of the agent response
         """
-        logger.info(f"Starting streaming process for message: id={message.id}")
+        logger.info("Starting streaming process for message: id={}", message.id)
 
         try:
             # Update state to processing
             await self.queue_manager.update_state(message.id, MessageState.PROCESSING)
 
-            chunks = []
+            buffer = io.StringIO()
 
             # Stream agent output
             async for chunk in self._stream_agent(message):
-                chunks.append(chunk)
+                buffer.write(chunk)
                 yield chunk
 
             # Store complete result
-            result = "".join(chunks)
-            await self.queue_manager.set_result(message.id, result)
-            await self.queue_manager.update_state(message.id, MessageState.COMPLETED)
+            await self.queue_manager.complete(message.id, buffer.getvalue())
 
-            logger.info(f"Message streaming completed: id={message.id}")
+            logger.info("Message streaming completed: id={}", message.id)
 
         except asyncio.TimeoutError:
             error_msg = f"Processing timeout after {settings.processing_timeout}s"
-            logger.error(f"Message streaming timeout: id={message.id}")
+            logger.error("Message streaming timeout: id={}", message.id)
             await self.queue_manager.update_state(
                 message.id, MessageState.FAILED, error=error_msg
             )
@@ -156,7 +214,8 @@ class AgentProcessor:
 
         except Exception as e:
             error_msg = f"Agent error: {str(e)}"
-            logger.error(f"Message streaming error: id={message.id}, error={e}", exc_info=True)
+            logger.error("Message streaming error: id={}, error={}", message.id, e)
+            logger.opt(exception=e).debug("Message streaming traceback: id={}", message.id)
             await self.queue_manager.update_state(
                 message.id, MessageState.FAILED, error=error_msg
             )
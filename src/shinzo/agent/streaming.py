@@ -1,13 +1,18 @@
 """Streaming logic for agent responses."""
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Optional, Tuple
+
+from langchain_core.messages import AIMessageChunk
 
 from shinzo.models import QueuedMessage
 from shinzo.agent.history import build_conversation_history
 
 
 async def stream_agent_response(
-    agent, message: QueuedMessage, queue_manager
+    agent,
+    message: QueuedMessage,
+    queue_manager,
+    messages: Optional[List[Tuple[str, str]]] = None,
 ) -> AsyncGenerator[str, None]:
     """
     Stream output from the LangGraph agent.
@@ -16,30 +21,21 @@ async def stream_agent_response(
         agent: The LangGraph agent instance
         message: The QueuedMessage to process
         queue_manager: Queue manager for retrieving thread history
+        messages: Conversation history already built for this message, if any
 
     Yields:
         Chunks of the agent response
     """
-    try:
-        # Build conversation history
+    # Build conversation history
+    if messages is None:
         messages = await build_conversation_history(message, queue_manager)
 
-        # Prepare input for agent
-        inputs = {"messages": messages}
-
-        # Stream agent output
-        # Note: LangGraph's streaming may vary based on version
-        # This is a simplified implementation
-        async for event in agent.astream_events(inputs, version="v1"):
-            # Extract content from different event types
-            if event["event"] == "on_chat_model_stream":
-                content = event["data"].get("chunk", {}).content
-                if content:
-                    yield content
-
-    except Exception as e:
-        from shinzo.utils import get_logger
-        logger = get_logger(__name__)
-        logger.error(f"Agent streaming error: {e}", exc_info=True)
-        raise
+    # Prepare input for agent
+    inputs = {"messages": messages}
 
+    # Stream LLM tokens directly; "messages" mode yields (message_chunk, metadata)
+    # tuples without wrapping every graph event in an envelope dict
+    async for message_chunk, _metadata in agent.astream(inputs, stream_mode="messages"):
+        # Only forward model tokens, not tool results written back to the state
+        if isinstance(message_chunk, AIMessageChunk) and message_chunk.content:
+            yield message_chunk.content
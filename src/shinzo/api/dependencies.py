@@ -0,0 +1,30 @@
+"""FastAPI dependencies shared by the API routers."""
+
+from fastapi import HTTPException, Request, status
+
+from shinzo.queue import QueueManager
+
+
+def get_queue_manager(request: Request) -> QueueManager:
+    """
+    Resolve the application's queue manager
+
+    The queue manager is created during lifespan startup and stored on
+    app.state, so routes receive it through Depends instead of a module global.
+
+    Args:
+        request: The incoming request
+
+    Returns:
+        The shared QueueManager instance
+
+    Raises:
+        HTTPException: If the application has not finished starting up
+    """
+    queue_manager = getattr(request.app.state, "queue_manager", None)
+    if queue_manager is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Queue manager not initialized",
+        )
+    return queue_manager
@@ -1,33 +1,28 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 import uuid
 
 from shinzo.models import (
     MessageSubmitRequest,
     MessageSubmitResponse,
     MessageStatusResponse,
+    MessageCancelResponse,
+    HealthResponse,
     QueueSummaryResponse,
     MessageState,
 )
 from shinzo.queue import QueueManager
+from shinzo.api.dependencies import get_queue_manager
 from shinzo.utils import get_logger
 
 
 logger = get_logger(__name__)
 router = APIRouter()
 
-# This will be injected by the main app
-queue_manager: Optional[QueueManager] = None
-
-
-def set_queue_manager(qm: QueueManager):
-    """Set the queue manager instance"""
-    global queue_manager
-    queue_manager = qm
-
-
 @router.post("/messages", response_model=MessageSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
-async def submit_message(request: MessageSubmitRequest):
+async def submit_message(
+    request: MessageSubmitRequest,
+    queue_manager: QueueManager = Depends(get_queue_manager),
+):
     """
     Submit a new message to the queue
 
@@ -37,12 +32,6 @@ async def submit_message(request: MessageSubmitRequest):
     Returns:
         MessageSubmitResponse with message ID and queue position
     """
-    if not queue_manager:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Queue manager not initialized",
-        )
-
     try:
         # Generate thread_id if not provided by client
         thread_id = request.thread_id or str(uuid.uuid4())
@@ -71,7 +60,7 @@ async def submit_message(request: MessageSubmitRequest):
         )
 
     except Exception as e:
-        logger.error(f"Error submitting message: {e}", exc_info=True)
+        logger.exception("Error submitting message: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to submit message",
@@ -79,7 +68,10 @@ async def submit_message(request: MessageSubmitRequest):
 
 
 @router.get("/messages/{message_id}/status", response_model=MessageStatusResponse)
-async def get_message_status(message_id: str):
+async def get_message_status(
+    message_id: str,
+    queue_manager: QueueManager = Depends(get_queue_manager),
+):
     """
     Get the status of a message
 
@@ -89,12 +81,6 @@ async def get_message_status(message_id: str):
     Returns:
         MessageStatusResponse with current state and details
     """
-    if not queue_manager:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Queue manager not initialized",
-        )
-
     message = await queue_manager.get_message(message_id)
 
     if not message:
@@ -123,8 +109,15 @@ async def get_message_status(message_id: str):
     )
 
 
-@router.delete("/messages/{message_id}", status_code=status.HTTP_200_OK)
-async def cancel_message(message_id: str):
+@router.delete(
+    "/messages/{message_id}",
+    response_model=MessageCancelResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def cancel_message(
+    message_id: str,
+    queue_manager: QueueManager = Depends(get_queue_manager),
+):
     """
     Cancel a queued message
 
@@ -134,12 +127,6 @@ async def cancel_message(message_id: str):
     Returns:
         Success message
     """
-    if not queue_manager:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Queue manager not initialized",
-        )
-
     success, error = await queue_manager.cancel_message(message_id)
 
     if not success:
@@ -154,33 +141,27 @@ async def cancel_message(message_id: str):
                 detail=error,
             )
 
-    logger.info(f"Message cancelled via API: id={message_id}")
+    logger.info("Message cancelled via API: id={}", message_id)
 
-    return {"message": "Message cancelled successfully", "message_id": message_id}
+    return MessageCancelResponse(message="Message cancelled successfully", message_id=message_id)
 
 
 @router.get("/queue", response_model=QueueSummaryResponse)
-async def get_queue_summary():
+async def get_queue_summary(queue_manager: QueueManager = Depends(get_queue_manager)):
     """
     Get a summary of the queue state
 
     Returns:
         QueueSummaryResponse with queue statistics
     """
-    if not queue_manager:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Queue manager not initialized",
-        )
-
     summary = await queue_manager.get_queue_summary()
     return summary
 
 
-@router.get("/health")
-async def health_check():
+@router.get("/health", response_model=HealthResponse)
+async def health_check(request: Request):
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "queue_initialized": queue_manager is not None,
-    }
+    return HealthResponse(
+        status="healthy",
+        queue_initialized=getattr(request.app.state, "queue_manager", None) is not None,
+    )
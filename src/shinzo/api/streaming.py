@@ -1,11 +1,12 @@
 import asyncio
 import json
-from typing import AsyncGenerator, Optional
-from fastapi import APIRouter, HTTPException, status
+from typing import AsyncGenerator, Iterator, List
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 
-from shinzo.models import MessageState, SSEEvent
+from shinzo.models import MessageState, SSEEvent, format_chunk_event
 from shinzo.queue import QueueManager
+from shinzo.api.dependencies import get_queue_manager
 from shinzo.config import settings
 from shinzo.utils import get_logger
 
@@ -13,33 +14,45 @@ from shinzo.utils import get_logger
 logger = get_logger(__name__)
 router = APIRouter()
 
-# This will be injected by the main app
-queue_manager: Optional[QueueManager] = None
+# How often a queued message re-checks its queue position (seconds)
+QUEUE_POSITION_REFRESH_INTERVAL = 2.0
 
+# Maximum number of chunks coalesced into a single SSE chunk event
+MAX_CHUNK_BATCH = 64
 
-def set_queue_manager(qm: QueueManager):
-    """Set the queue manager instance"""
-    global queue_manager
-    queue_manager = qm
+# Pre-encoded SSE comment frame sent when a stream is idle
+KEEPALIVE_FRAME = b": keepalive\n\n"
 
 
-async def generate_sse_events(message_id: str) -> AsyncGenerator[str, None]:
+def format_chunk_batches(chunks: List[str], first_index: int) -> Iterator[bytes]:
+    """
+    Coalesce pending chunks into as few SSE chunk events as possible
+
+    Args:
+        chunks: Chunks that have not been sent to the client yet
+        first_index: Index of the first chunk in the message stream
+
+    Yields:
+        SSE-formatted chunk events, each covering up to MAX_CHUNK_BATCH chunks
+    """
+    for start in range(0, len(chunks), MAX_CHUNK_BATCH):
+        batch = chunks[start:start + MAX_CHUNK_BATCH]
+        yield format_chunk_event("".join(batch), first_index + start, len(batch))
+
+
+async def generate_sse_events(
+    message_id: str, queue_manager: QueueManager
+) -> AsyncGenerator[bytes, None]:
     """
     Generate Server-Sent Events for a message
 
     Args:
         message_id: The message ID to stream
+        queue_manager: Queue manager holding the message
 
     Yields:
-        SSE-formatted event strings
+        Encoded SSE event frames
     """
-    if not queue_manager:
-        yield SSEEvent(
-            event="error",
-            data={"error": "Queue manager not initialized"}
-        ).format()
-        return
-
     # Get initial message state
     message = await queue_manager.get_message(message_id)
 
@@ -50,135 +63,151 @@ async def generate_sse_events(message_id: str) -> AsyncGenerator[str, None]:
         ).format()
         return
 
-    last_chunk_count = 0
+    next_chunk_seq = 0
+    last_position = None
     keepalive_counter = 0
 
+    # Chunks are only stored while someone is listening
+    queue_manager.subscribe(message_id)
+
     try:
         while True:
-            # Refresh message state
-            message = await queue_manager.get_message(message_id)
+            # Grab the update event before reading state so no update is missed
+            update_event = queue_manager.get_update_event(message_id)
+
+            # Refresh message state without touching chunks or payload fields
+            light_status = await queue_manager.get_light_status(message_id)
 
-            if not message:
+            if not light_status:
                 yield SSEEvent(
                     event="error",
                     data={"error": "Message lost during streaming"}
                 ).format()
                 return
 
+            message_state, completed_at, error = light_status
+
             # Handle different states
-            if message.state == MessageState.QUEUED:
-                # Send waiting status with queue position
+            if message_state == MessageState.QUEUED:
+                # Send waiting status whenever the queue position changes
                 position = await queue_manager.get_queue_position(message_id)
 
-                yield SSEEvent(
-                    event="waiting",
-                    data={
-                        "state": "queued",
-                        "position": position,
-                        "message": "Waiting in queue",
-                    }
-                ).format()
-
-                # Wait before checking again
-                await asyncio.sleep(2.0)
-                keepalive_counter += 2
-
-            elif message.state == MessageState.PROCESSING:
+                if position != last_position:
+                    yield SSEEvent(
+                        event="waiting",
+                        data={
+                            "state": "queued",
+                            "position": position,
+                            "message": "Waiting in queue",
+                        }
+                    ).format()
+                    last_position = position
+
+                # Positions shift as other threads dequeue, so re-check periodically
+                wait_timeout = QUEUE_POSITION_REFRESH_INTERVAL
+
+            elif message_state == MessageState.PROCESSING:
                 # Check if there are new chunks
-                if len(message.chunks) > last_chunk_count:
-                    # Send new chunks
-                    for i in range(last_chunk_count, len(message.chunks)):
-                        chunk = message.chunks[i]
-                        yield SSEEvent(
-                            event="chunk",
-                            data={
-                                "type": "content",
-                                "chunk": chunk,
-                                "index": i,
-                            }
-                        ).format()
-
-                    last_chunk_count = len(message.chunks)
+                chunks, seq = await queue_manager.drain_chunks(message_id, since=next_chunk_seq)
+                if chunks:
+                    first_index = seq - len(chunks)
+                    if first_index > next_chunk_seq:
+                        logger.warning(
+                            "Stream fell behind, skipped chunks: id={}, skipped={}",
+                            message_id,
+                            first_index - next_chunk_seq,
+                        )
+
+                    # Send everything that arrived since the last wake-up in one event
+                    for event in format_chunk_batches(chunks, first_index):
+                        yield event
+
+                    next_chunk_seq = seq
                     keepalive_counter = 0
-                else:
-                    # No new chunks, wait briefly
-                    await asyncio.sleep(0.5)
-                    keepalive_counter += 0.5
 
-            elif message.state == MessageState.COMPLETED:
+                wait_timeout = settings.keepalive_interval
+
+            elif message_state == MessageState.COMPLETED:
                 # Send any remaining chunks
-                if len(message.chunks) > last_chunk_count:
-                    for i in range(last_chunk_count, len(message.chunks)):
-                        chunk = message.chunks[i]
-                        yield SSEEvent(
-                            event="chunk",
-                            data={
-                                "type": "content",
-                                "chunk": chunk,
-                                "index": i,
-                            }
-                        ).format()
+                chunks, seq = await queue_manager.drain_chunks(message_id, since=next_chunk_seq)
+                for event in format_chunk_batches(chunks, seq - len(chunks)):
+                    yield event
+
+                # The result is only needed once, so fetch the full message here
+                message = await queue_manager.get_message(message_id)
 
                 # Send completion event
                 yield SSEEvent(
                     event="done",
                     data={
                         "state": "completed",
-                        "result": message.result or "",
-                        "completed_at": message.completed_at.isoformat() if message.completed_at else None,
+                        "result": (message.result if message else None) or "",
+                        "completed_at": completed_at,
                     }
                 ).format()
 
-                logger.info(f"Stream completed for message: id={message_id}")
+                logger.info("Stream completed for message: id={}", message_id)
                 return
 
-            elif message.state == MessageState.FAILED:
+            elif message_state == MessageState.FAILED:
                 # Send error event
                 yield SSEEvent(
                     event="error",
                     data={
                         "state": "failed",
-                        "error": message.error or "Unknown error",
-                        "completed_at": message.completed_at.isoformat() if message.completed_at else None,
+                        "error": error or "Unknown error",
+                        "completed_at": completed_at,
                     }
                 ).format()
 
-                logger.info(f"Stream ended with error for message: id={message_id}")
+                logger.info("Stream ended with error for message: id={}", message_id)
                 return
 
-            elif message.state == MessageState.CANCELLED:
+            elif message_state == MessageState.CANCELLED:
                 # Send cancelled event
                 yield SSEEvent(
                     event="cancelled",
                     data={
                         "state": "cancelled",
                         "message": "Message was cancelled",
-                        "completed_at": message.completed_at.isoformat() if message.completed_at else None,
+                        "completed_at": completed_at,
                     }
                 ).format()
 
-                logger.info(f"Stream ended (cancelled) for message: id={message_id}")
+                logger.info("Stream ended (cancelled) for message: id={}", message_id)
                 return
 
+            # Sleep until the message changes instead of polling
+            if await queue_manager.wait_for_update(update_event, wait_timeout):
+                continue
+
             # Send keepalive if no activity
+            keepalive_counter += wait_timeout
             if keepalive_counter >= settings.keepalive_interval:
-                yield ": keepalive\n\n"
+                yield KEEPALIVE_FRAME
                 keepalive_counter = 0
 
     except asyncio.CancelledError:
-        logger.info(f"Stream cancelled for message: id={message_id}")
+        logger.info("Stream cancelled for message: id={}", message_id)
         raise
 
     except Exception as e:
-        logger.error(f"Stream error for message {message_id}: {e}", exc_info=True)
+        logger.error("Stream error for message {}: {}", message_id, e)
+        logger.opt(exception=e).debug("Stream traceback for message {}", message_id)
         yield SSEEvent(
             event="error",
             data={"error": f"Streaming error: {str(e)}"}
         ).format()
 
+    finally:
+        queue_manager.unsubscribe(message_id)
+
 
 @router.get("/messages/{message_id}/stream")
-async def stream_message(message_id: str):
+async def stream_message(
+    message_id: str,
+    queue_manager: QueueManager = Depends(get_queue_manager),
+):
     """
     Stream message processing events via Server-Sent Events
 
@@ -188,12 +217,6 @@ async def stream_message(message_id: str):
     Returns:
         StreamingResponse with SSE events
     """
-    if not queue_manager:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Queue manager not initialized",
-        )
-
     # Verify message exists
     message = await queue_manager.get_message(message_id)
 
@@ -203,11 +226,11 @@ async def stream_message(message_id: str):
             detail=f"Message not found: {message_id}",
         )
 
-    logger.info(f"Starting SSE stream for message: id={message_id}, state={message.state}")
+    logger.info("Starting SSE stream for message: id={}, state={}", message_id, message.state)
 
     # Return SSE streaming response
     return StreamingResponse(
-        generate_sse_events(message_id),
+        generate_sse_events(message_id, queue_manager),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
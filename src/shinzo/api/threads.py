@@ -1,6 +1,6 @@
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from shinzo.models import (
     MessageState,
@@ -10,36 +10,15 @@ from shinzo.models import (
     ThreadSummary,
 )
 from shinzo.queue import QueueManager
+from shinzo.api.dependencies import get_queue_manager
 from shinzo.utils import get_logger
 
 
 logger = get_logger(__name__)
 router = APIRouter()
 
-# This will be injected by the main app
-queue_manager: Optional[QueueManager] = None
-
-
-def set_queue_manager(qm: QueueManager):
-    """Set the queue manager instance"""
-    global queue_manager
-    queue_manager = qm
-
-
-async def _ensure_queue_manager() -> QueueManager:
-    if not queue_manager:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Queue manager not initialized",
-        )
-    return queue_manager
-
-
-async def _message_to_status(message, qm: QueueManager) -> MessageStatusResponse:
-    queue_position = None
-    if message.state == MessageState.QUEUED:
-        queue_position = await qm.get_queue_position(message.id)
 
+def _message_to_status(message, queue_position: Optional[int]) -> MessageStatusResponse:
     return MessageStatusResponse(
         message_id=message.id,
         state=message.state,
@@ -56,22 +35,28 @@ async def _message_to_status(message, qm: QueueManager) -> MessageStatusResponse
 
 
 @router.get("/threads", response_model=list[ThreadSummary])
-async def list_threads():
+async def list_threads(qm: QueueManager = Depends(get_queue_manager)):
     """
     List all threads with summary information ordered by last activity
     """
-    qm = await _ensure_queue_manager()
     summaries = await qm.list_threads()
-    logger.info("Retrieved %s threads", len(summaries))
+    logger.info("Retrieved {} threads", len(summaries))
     return summaries
 
 
 @router.get("/threads/{thread_id}/messages", response_model=ThreadMessagesResponse)
-async def get_thread_messages(thread_id: str):
+async def get_thread_messages(
+    thread_id: str,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    qm: QueueManager = Depends(get_queue_manager),
+):
     """
-    Retrieve all messages for a specific thread in chronological order
+    Retrieve messages for a specific thread in chronological order
+
+    Use limit and offset to page through long threads; total_messages is
+    always the size of the whole thread.
     """
-    qm = await _ensure_queue_manager()
 
     metadata = await qm.get_thread_metadata(thread_id)
     if not metadata:
@@ -80,24 +65,31 @@ async def get_thread_messages(thread_id: str):
             detail=f"Thread not found: {thread_id}",
         )
 
-    messages = await qm.get_thread_messages(thread_id)
+    messages = await qm.get_thread_messages(thread_id, limit=limit, offset=offset)
+
+    # Resolve each queued message's position with an O(log N) index lookup
+    positions = await qm.get_queue_positions(
+        [message.id for message in messages if message.state == MessageState.QUEUED]
+    )
     message_responses = [
-        await _message_to_status(message, qm) for message in messages
+        _message_to_status(message, positions.get(message.id)) for message in messages
     ]
 
     return ThreadMessagesResponse(
         thread_id=thread_id,
-        total_messages=len(message_responses),
+        total_messages=metadata.message_count,
         messages=message_responses,
     )
 
 
 @router.get("/threads/{thread_id}", response_model=ThreadMetadata)
-async def get_thread_metadata(thread_id: str):
+async def get_thread_metadata(
+    thread_id: str,
+    qm: QueueManager = Depends(get_queue_manager),
+):
     """
     Retrieve metadata for a specific thread
     """
-    qm = await _ensure_queue_manager()
     metadata = await qm.get_thread_metadata(thread_id)
 
     if not metadata:
@@ -4,6 +4,16 @@ from pydantic_settings import BaseSettings
 from typing import Optional
 
 
+# Provider API key settings and the environment variables LangChain reads them from
+PROVIDER_KEY_ENV_VARS = {
+    "openai_api_key": "OPENAI_API_KEY",
+    "anthropic_api_key": "ANTHROPIC_API_KEY",
+    "xai_api_key": "XAI_API_KEY",
+    "google_genai_api_key": "GOOGLE_API_KEY",
+    "groq_api_key": "GROQ_API_KEY",
+}
+
+
 class Settings(BaseSettings):
     """Application configuration settings"""
     
@@ -16,6 +26,10 @@ class Settings(BaseSettings):
     # LangGraph/OpenAI Model Configuration
     openai_api_key: str = ""
     model: str = "xai:grok-4-1-fast"
+    system_prompt: Optional[str] = None  # static instructions sent ahead of every conversation
+    history_window_turns: int = 0  # earlier exchanges sent with each message (0 = whole thread)
+    response_cache_size: int = 0  # identical conversations answered from memory (0 = disabled)
+    response_cache_ttl_seconds: float = 300  # cached responses expire after this (0 = never)
 
     # Anthropic Configuration
     anthropic_api_key: Optional[str] = None
@@ -46,42 +60,36 @@ class Settings(BaseSettings):
         if self.google_api_key and not self.google_genai_api_key:
             self.google_genai_api_key = self.google_api_key
 
-        # Apply os_api_key to any unset model provider keys
+        # Apply os_api_key to any unset model provider keys, then export each key
+        # for LangChain's init_chat_model (skipping writes that would change nothing)
         os_api_key = self.os_api_key or os.environ.get("OS_API_KEY")
-        if os_api_key:
-            if not self.openai_api_key:
-                self.openai_api_key = os_api_key
-            if not self.anthropic_api_key:
-                self.anthropic_api_key = os_api_key
-            if not self.xai_api_key:
-                self.xai_api_key = os_api_key
-            if not self.google_genai_api_key:
-                self.google_genai_api_key = os_api_key
-            if not self.groq_api_key:
-                self.groq_api_key = os_api_key
-
-        # Set environment variables for LangChain's init_chat_model to use
-        if self.openai_api_key:
-            os.environ["OPENAI_API_KEY"] = self.openai_api_key
-        if self.anthropic_api_key:
-            os.environ["ANTHROPIC_API_KEY"] = self.anthropic_api_key
-        if self.xai_api_key:
-            os.environ["XAI_API_KEY"] = self.xai_api_key
-        if self.google_genai_api_key:
-            os.environ["GOOGLE_API_KEY"] = self.google_genai_api_key
-        if self.groq_api_key:
-            os.environ["GROQ_API_KEY"] = self.groq_api_key
+        for field, env_var in PROVIDER_KEY_ENV_VARS.items():
+            if os_api_key and not getattr(self, field):
+                setattr(self, field, os_api_key)
+            value = getattr(self, field)
+            if value and os.environ.get(env_var) != value:
+                os.environ[env_var] = value
 
     # Queue Configuration
     max_queue_size: int = 1000
     processing_timeout: int = 60  # seconds
+    max_concurrent_agents: int = 16  # agent calls in flight across all threads
+    message_retention_seconds: int = 86400  # keep finished messages this long (0 = forever)
+    max_finished_messages: int = 10000  # keep at most this many finished messages (0 = no limit)
+
+    # LLM HTTP Client Configuration
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 100
+    http_connect_timeout: float = 5.0  # seconds
 
     # SSE Configuration
     keepalive_interval: int = 30  # seconds
+    max_in_memory_chunks: int = 1000  # unread chunks retained per streaming message
 
     # Application Configuration
     host: str = "0.0.0.0"
     port: int = 8000
+    event_loop: str = "auto"  # uvicorn loop implementation ("auto" picks uvloop when installed)
     log_level: str = "INFO"
 
 
@@ -5,6 +5,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from shinzo.config import settings
 from shinzo.queue import QueueManager
 from shinzo.agent import AgentProcessor
+from shinzo.agent.http_client import close_http_client
 from shinzo.worker import Worker
 from shinzo.api import routes, streaming, threads
 from shinzo.utils import setup_logging, get_logger
@@ -39,10 +40,8 @@ async def lifespan(app: FastAPI):
         agent_processor = AgentProcessor(queue_manager)
         worker = Worker(queue_manager, agent_processor)
 
-        # Inject queue_manager into routers
-        routes.set_queue_manager(queue_manager)
-        streaming.set_queue_manager(queue_manager)
-        threads.set_queue_manager(queue_manager)
+        # Expose queue_manager to routers via the get_queue_manager dependency
+        app.state.queue_manager = queue_manager
 
         # Start worker
         await worker.start()
@@ -52,7 +51,7 @@ async def lifespan(app: FastAPI):
         yield
 
     except Exception as e:
-        logger.error(f"Failed to start application: {e}", exc_info=True)
+        logger.exception(f"Failed to start application: {e}")
         raise
 
     finally:
@@ -62,8 +61,13 @@ async def lifespan(app: FastAPI):
         if worker:
             await worker.stop()
 
+        await close_http_client()
+
         logger.info("Agent Queue System shut down")
 
+        # Wait for the background log writer to flush queued records
+        await logger.complete()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -106,5 +110,6 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=True,
+        loop=settings.event_loop,
         log_level=settings.log_level.lower(),
     )
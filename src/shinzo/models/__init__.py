@@ -1,7 +1,8 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict
-from pydantic import BaseModel, Field
+from typing import Optional, Dict, Deque
+from pydantic import BaseModel, ConfigDict, Field
+import orjson
 import uuid
 
 
@@ -31,20 +32,23 @@ PRIORITY_MAP = {
 
 class QueuedMessage(BaseModel):
     """Internal representation of a queued message"""
+    model_config = ConfigDict(use_enum_values=False)
+
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_message: str
     priority: Priority = Priority.NORMAL
+    priority_value: int = PRIORITY_MAP[Priority.NORMAL]  # PRIORITY_MAP[priority], resolved once
     state: MessageState = MessageState.QUEUED
     thread_id: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at_iso: Optional[str] = None  # created_at formatted once for queue summaries
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    completed_at_iso: Optional[str] = None  # completed_at formatted once for SSE events
     result: Optional[str] = None
     error: Optional[str] = None
-    chunks: list[str] = Field(default_factory=list)
-
-    class Config:
-        use_enum_values = False
+    chunks: Optional[Deque[str]] = None  # Allocated on the first chunk, dropped once finished
+    chunk_seq: int = 0  # Total number of chunks ever added (monotonic)
 
 
 class MessageSubmitRequest(BaseModel):
@@ -78,6 +82,18 @@ class MessageStatusResponse(BaseModel):
     thread_id: Optional[str] = None
 
 
+class MessageCancelResponse(BaseModel):
+    """Response model for message cancellation"""
+    message: str
+    message_id: str
+
+
+class HealthResponse(BaseModel):
+    """Response model for the health check"""
+    status: str
+    queue_initialized: bool
+
+
 class QueueSummaryResponse(BaseModel):
     """Response model for queue summary"""
     total_queued: int
@@ -94,19 +110,32 @@ class SSEEvent(BaseModel):
     event: Optional[str] = None
     data: dict
 
-    def format(self) -> str:
-        """Format as SSE event string"""
-        lines = []
+    def format(self) -> bytes:
+        """Format as an encoded SSE event frame"""
         if self.event:
-            lines.append(f"event: {self.event}")
+            return b"event: %s\ndata: %s\n\n" % (self.event.encode(), orjson.dumps(self.data))
+        return b"data: %s\n\n" % orjson.dumps(self.data)
+
+
+def format_chunk_event(chunk: str, index: int, count: int = 1) -> bytes:
+    """
+    Format a content chunk as an SSE frame without building an SSEEvent
+
+    Chunk events are the highest-frequency events on a stream, so the constant
+    parts of the frame are templated and only the chunk text is JSON-encoded.
 
-        # Convert data to JSON string
-        import json
-        data_str = json.dumps(self.data)
-        lines.append(f"data: {data_str}")
-        lines.append("")  # Empty line to end event
+    Args:
+        chunk: Chunk text to send
+        index: Index of the first chunk in the message stream
+        count: Number of chunks coalesced into this event
 
-        return "\n".join(lines) + "\n"
+    Returns:
+        Encoded SSE chunk event, equivalent to SSEEvent(event="chunk", ...).format()
+    """
+    return (
+        b'event: chunk\ndata: {"type":"content","chunk":%s,"index":%d,"count":%d}\n\n'
+        % (orjson.dumps(chunk), index, count)
+    )
 
 
 class ThreadMetadata(BaseModel):
@@ -116,6 +145,7 @@ class ThreadMetadata(BaseModel):
     created_at: datetime
     last_activity: datetime
     states: Dict[MessageState, int]
+    last_message_id: Optional[str] = None  # Most recently enqueued message in the thread
 
 
 class ThreadSummary(BaseModel):
@@ -0,0 +1,55 @@
+"""FIFO message queue bucketed by priority level."""
+
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from shinzo.models import PRIORITY_MAP
+
+
+class PriorityBuckets:
+    """
+    Per-thread queue of message IDs with one FIFO deque per priority level.
+
+    With only a handful of priority levels, bucketed deques give O(1) push and
+    pop without building or comparing heap entries.
+    """
+
+    __slots__ = ("_buckets", "_by_priority", "_size")
+
+    def __init__(self):
+        # Buckets in dequeue order (lowest priority value = highest priority)
+        self._buckets: Tuple[Deque[str], ...] = tuple(deque() for _ in PRIORITY_MAP)
+        self._by_priority: Dict[int, Deque[str]] = dict(
+            zip(sorted(PRIORITY_MAP.values()), self._buckets)
+        )
+        self._size = 0
+
+    def put(self, priority_value: int, message_id: str) -> None:
+        """Append a message ID to the bucket for its priority."""
+        self._by_priority[priority_value].append(message_id)
+        self._size += 1
+
+    def get_nowait(self) -> Optional[str]:
+        """Pop the oldest message ID from the highest non-empty priority, or None."""
+        for bucket in self._buckets:
+            if bucket:
+                self._size -= 1
+                return bucket.popleft()
+        return None
+
+    def remove(self, priority_value: int, message_id: str) -> bool:
+        """Remove a waiting message ID, returning False if it is not queued."""
+        try:
+            self._by_priority[priority_value].remove(message_id)
+        except ValueError:
+            return False
+        self._size -= 1
+        return True
+
+    def empty(self) -> bool:
+        """Return True if no message IDs are waiting."""
+        return self._size == 0
+
+    def qsize(self) -> int:
+        """Return the number of waiting message IDs."""
+        return self._size
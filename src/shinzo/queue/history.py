@@ -0,0 +1,72 @@
+"""Per-thread cache of conversation turns for finished messages."""
+
+from itertools import islice
+from typing import Dict, List, Tuple
+
+from shinzo.models import QueuedMessage, MessageState
+from shinzo.queue.state import is_terminal_state
+
+
+# (role, content) pair as passed to the agent
+Turn = Tuple[str, str]
+
+
+class ThreadHistory:
+    """
+    Conversation turns for the leading run of finished messages in a thread.
+
+    Finished messages never change, so their turns are built once and reused
+    on every later turn of the conversation. Messages still queued or
+    processing are read fresh each time.
+    """
+
+    __slots__ = ("message_count", "turns")
+
+    def __init__(self):
+        # Number of leading thread messages whose turns are cached
+        self.message_count = 0
+        self.turns: List[Turn] = []
+
+
+def message_turns(message: QueuedMessage) -> List[Turn]:
+    """Build the turns a message contributes: its text, then its result once completed."""
+    turns = [("user", message.user_message)]
+    if message.result and message.state == MessageState.COMPLETED:
+        turns.append(("assistant", message.result))
+    return turns
+
+
+def build_thread_history(
+    history: ThreadHistory,
+    message_ids: Dict[str, None],
+    messages: Dict[str, QueuedMessage],
+    exclude_message_id: str,
+) -> List[Turn]:
+    """
+    Return the turns for every message in a thread except one.
+
+    Extends the cached prefix with any messages that finished since the last
+    call, then appends the turns of the messages that are still live.
+
+    Args:
+        history: The thread's cached history
+        message_ids: The thread's message IDs in chronological order
+        messages: All retained messages by ID
+        exclude_message_id: Message to leave out (the one being answered)
+
+    Returns:
+        List of (role, content) tuples in chronological order
+    """
+    for message_id in islice(message_ids, history.message_count, None):
+        message = messages.get(message_id)
+        if message is None or not is_terminal_state(message.state):
+            break
+        history.turns.extend(message_turns(message))
+        history.message_count += 1
+
+    turns = history.turns.copy()
+    for message_id in islice(message_ids, history.message_count, None):
+        message = messages.get(message_id)
+        if message is not None and message_id != exclude_message_id:
+            turns.extend(message_turns(message))
+    return turns
@@ -1,8 +1,13 @@
 """Main QueueManager class for managing message queues."""
 
 import asyncio
-from datetime import datetime
-from typing import Optional, Dict, Set, List
+import itertools
+import sys
+import time
+from collections import deque
+from typing import Deque, Optional, Dict, Set, List, Tuple
+
+from sortedcontainers import SortedList
 
 from shinzo.models import (
     QueuedMessage,
@@ -12,11 +17,15 @@ from shinzo.models import (
     ThreadMetadata,
     ThreadSummary,
 )
+from shinzo.config import settings
 from shinzo.queue.types import CancelResult
+from shinzo.queue.buckets import PriorityBuckets
 from shinzo.queue import state
 from shinzo.queue import threads
 from shinzo.queue import operations
 from shinzo.queue import summary
+from shinzo.queue import notifications
+from shinzo.queue import history
 from shinzo.utils import get_logger
 
 
@@ -24,31 +33,91 @@ logger = get_logger(__name__)
 
 
 class QueueManager:
-    """Manages the in-memory message queue with priority support"""
+    """
+    Manages the in-memory message queue with priority support.
 
-    def __init__(self):
-        # Per-thread priority queues for message processing
-        self._thread_queues: Dict[str, asyncio.PriorityQueue] = {}
+    State is only touched from the event loop and no method awaits while
+    mutating it, so each operation is atomic without locks. Keep it that way
+    when adding methods: finish all mutations before the first await.
+    """
+
+    def __init__(
+        self,
+        max_in_memory_chunks: Optional[int] = None,
+        message_retention_seconds: Optional[float] = None,
+        max_finished_messages: Optional[int] = None,
+    ):
+        # Maximum number of unread streaming chunks retained per message
+        self._max_in_memory_chunks = max_in_memory_chunks or settings.max_in_memory_chunks
+
+        # How long finished messages are kept before eviction (0 keeps them forever)
+        self._message_retention_seconds = (
+            settings.message_retention_seconds
+            if message_retention_seconds is None
+            else message_retention_seconds
+        )
+
+        # How many finished messages are kept before the oldest are evicted (0 = no limit)
+        self._max_finished_messages = (
+            settings.max_finished_messages
+            if max_finished_messages is None
+            else max_finished_messages
+        )
+
+        # (finished_at, message_id) for finished messages, oldest first
+        self._finished_messages: Deque[Tuple[float, str]] = deque()
+
+        # Per-thread FIFO queues bucketed by priority for message processing
+        self._thread_queues: Dict[str, PriorityBuckets] = {}
 
         # Dictionary to store message metadata by ID
         self._messages: Dict[str, QueuedMessage] = {}
 
-        # Lock for thread-safe state transitions
-        self._lock = asyncio.Lock()
-
-        # Per-thread events to signal when new messages are added
-        self._thread_events: Dict[str, asyncio.Event] = {}
+        # Threads whose queue just went from empty to non-empty, in the order
+        # they became ready; the coordinator starts workers only for these
+        self._ready_threads: "asyncio.Queue[str]" = asyncio.Queue()
 
-        # Counter for insertion order (FIFO within same priority)
-        self._insertion_order_counter = 0
+        # Insertion order (FIFO within same priority)
+        self._insertion_order = itertools.count()
 
-        # Thread tracking indexes
-        self._thread_index: Dict[str, Set[str]] = {}
+        # Thread tracking indexes; each thread's message IDs are kept in
+        # insertion (chronological) order, dict keys serving as an ordered set
+        self._thread_index: Dict[str, Dict[str, None]] = {}
+        # Ordered from least to most recently active
         self._thread_metadata: Dict[str, ThreadMetadata] = {}
+
+        # Preview text of each thread's latest message, truncated once at enqueue
+        self._thread_previews: Dict[str, Optional[str]] = {}
+
+        # Cached conversation turns for each thread's finished messages
+        self._thread_histories: Dict[str, history.ThreadHistory] = {}
         
         # Set of thread IDs that have pending messages
         self._active_threads: Set[str] = set()
 
+        # Per-message events to notify streaming subscribers of new chunks/state
+        self._message_events: Dict[str, asyncio.Event] = {}
+
+        # Number of streaming subscribers attached to each message
+        self._subscribers: Dict[str, int] = {}
+
+        # Messages with a chunk wake-up already scheduled for this loop iteration
+        self._pending_chunk_updates: Set[str] = set()
+
+        # Queued messages ordered by (priority value, insertion order, id);
+        # a message's index in this list is its queue position
+        self._queued_index: SortedList = SortedList()
+        self._queue_keys: Dict[str, Tuple[int, int, str]] = {}
+
+        # Summary entries for queued messages, built once at enqueue since the
+        # listed fields never change while a message waits
+        self._queued_entries: Dict[str, dict] = {}
+
+        # Message counts per state and the messages currently processing,
+        # maintained on every transition so summaries never scan all messages
+        self._state_counts: Dict[MessageState, int] = {s: 0 for s in MessageState}
+        self._processing: Dict[str, QueuedMessage] = {}
+
     # ============================================================================
     # Public API: Message Queue Operations
     # ============================================================================
@@ -70,22 +139,26 @@ class QueueManager:
         Returns:
             The created QueuedMessage object
         """
-        async with self._lock:
-            message = operations.create_message(user_message, thread_id, priority)
-            self._messages[message.id] = message
-            threads.initialize_or_update_thread_metadata(
-                thread_id, message, self._thread_index, self._thread_metadata
-            )
-            operations.ensure_thread_resources(
-                thread_id, self._thread_queues, self._thread_events
-            )
-            self._insertion_order_counter = await operations.add_message_to_queue(
-                thread_id, priority, message.id, self._thread_queues, self._insertion_order_counter
-            )
-            self._active_threads.add(thread_id)
-            operations.log_message_enqueued(message, thread_id, self._thread_queues)
-            operations.signal_thread_message_available(thread_id, self._thread_events)
-            return message
+        self._evict_expired_messages()
+        # Every request parses its own copy of the thread ID; interning lets all
+        # of a thread's messages and index entries share one string
+        thread_id = sys.intern(thread_id)
+        message = operations.create_message(user_message, thread_id, priority)
+        self._messages[message.id] = message
+        threads.initialize_or_update_thread_metadata(
+            thread_id, message, self._thread_index, self._thread_metadata, self._thread_previews
+        )
+        operations.ensure_thread_resources(thread_id, self._thread_queues)
+        queue_key = (message.priority_value, next(self._insertion_order), message.id)
+        operations.add_message_to_queue(thread_id, message, self._thread_queues)
+        self._queue_keys[message.id] = queue_key
+        self._queued_index.add(queue_key)
+        self._queued_entries[message.id] = summary.build_queued_message_dict(message)
+        self._state_counts[MessageState.QUEUED] += 1
+        operations.signal_thread_ready(thread_id, self._active_threads, self._ready_threads)
+        operations.log_message_enqueued(message, thread_id, self._thread_queues)
+        notifications.create_message_event(message.id, self._message_events)
+        return message
 
     async def dequeue(self, thread_id: str) -> Optional[QueuedMessage]:
         """
@@ -95,29 +168,24 @@ class QueueManager:
             thread_id: The thread ID to dequeue from
 
         Returns:
-            The next QueuedMessage or None if thread queue is empty
-        """
-        async with self._lock:
-            if thread_id not in self._thread_queues:
-                return None
-            thread_queue = self._thread_queues[thread_id]
-
-        try:
-            _, _, message_id = thread_queue.get_nowait()
-            return await operations.process_dequeued_message(
-                thread_id,
-                thread_queue,
-                message_id,
-                self._messages,
-                self._active_threads,
-                self._lock,
-                self._update_thread_state_counts,
-            )
-        except asyncio.QueueEmpty:
-            async with self._lock:
-                self._active_threads.discard(thread_id)
+            The next QueuedMessage, skipping cancelled ones, or None if the
+            thread queue is empty
+        """
+        thread_queue = self._thread_queues.get(thread_id)
+        if thread_queue is None:
             return None
 
+        message = operations.pop_next_queued_message(
+            thread_id,
+            thread_queue,
+            self._messages,
+            self._active_threads,
+            self._update_thread_state_counts,
+        )
+        if message:
+            notifications.signal_message_update(message.id, self._message_events)
+        return message
+
     async def update_state(
         self, message_id: str, new_state: MessageState, error: Optional[str] = None
     ) -> bool:
@@ -132,22 +200,23 @@ class QueueManager:
         Returns:
             True if update was successful, False otherwise
         """
-        async with self._lock:
-            message = self._messages.get(message_id)
-            if not message:
-                logger.warning(f"Message not found for state update: id={message_id}")
-                return False
+        return self._transition(message_id, new_state, error)
 
-            if not state.validate_state_transition(message.state, new_state):
-                logger.warning(
-                    f"Invalid state transition: id={message_id}, "
-                    f"from={message.state}, to={new_state}"
-                )
-                return False
+    async def complete(self, message_id: str, result: str) -> bool:
+        """
+        Store a message's result and mark it completed in one step.
 
-            return state.apply_state_change(
-                message, new_state, error, message_id, self._update_thread_state_counts
-            )
+        Subscribers are woken once, and never see the result without the
+        COMPLETED state (or the reverse).
+
+        Args:
+            message_id: The message ID
+            result: The agent result text
+
+        Returns:
+            True if the message was completed, False otherwise
+        """
+        return self._transition(message_id, MessageState.COMPLETED, result=result)
 
     async def get_message(self, message_id: str) -> Optional[QueuedMessage]:
         """
@@ -159,8 +228,25 @@ class QueueManager:
         Returns:
             The QueuedMessage or None if not found
         """
-        async with self._lock:
-            return self._messages.get(message_id)
+        # A single dict lookup never interleaves with a writer, so no lock is needed
+        return self._messages.get(message_id)
+
+    async def get_light_status(
+        self, message_id: str
+    ) -> Optional[Tuple[MessageState, Optional[str], Optional[str]]]:
+        """
+        Get just the fields needed to follow a message's progress.
+
+        Args:
+            message_id: The message ID
+
+        Returns:
+            Tuple of (state, completed_at ISO string, error) or None if not found
+        """
+        message = self._messages.get(message_id)
+        if not message:
+            return None
+        return message.state, message.completed_at_iso, message.error
 
     async def cancel_message(self, message_id: str) -> CancelResult:
         """
@@ -172,20 +258,23 @@ class QueueManager:
         Returns:
             CancelResult with success status and optional error message
         """
-        async with self._lock:
-            message = self._messages.get(message_id)
-            if not message:
-                return CancelResult(False, "Message not found")
+        # Writes to a single message never await, so they can't interleave
+        # with each other and need no lock
+        message = self._messages.get(message_id)
+        if not message:
+            return CancelResult(False, "Message not found")
 
-            if message.state != MessageState.QUEUED:
-                return CancelResult(False, f"Cannot cancel message in state: {message.state}")
+        if message.state != MessageState.QUEUED:
+            return CancelResult(False, f"Cannot cancel message in state: {message.state}")
 
-            old_state = message.state
-            message.state = MessageState.CANCELLED
-            message.completed_at = datetime.utcnow()
-            self._update_thread_state_counts(message, old_state, MessageState.CANCELLED)
-            logger.info(f"Message cancelled: id={message_id}")
-            return CancelResult(True, None)
+        old_state = message.state
+        message.state = MessageState.CANCELLED
+        state.update_message_timestamps(message, MessageState.CANCELLED)
+        self._update_thread_state_counts(message, old_state, MessageState.CANCELLED)
+        operations.remove_from_queue(message, self._thread_queues, self._active_threads)
+        notifications.signal_message_update(message_id, self._message_events, final=True)
+        logger.info("Message cancelled: id={}", message_id)
+        return CancelResult(True, None)
 
     async def set_result(self, message_id: str, result: str) -> bool:
         """
@@ -198,12 +287,12 @@ class QueueManager:
         Returns:
             True if successful, False otherwise
         """
-        async with self._lock:
-            message = self._messages.get(message_id)
-            if not message:
-                return False
-            message.result = result
-            return True
+        message = self._messages.get(message_id)
+        if not message:
+            return False
+        message.result = result
+        notifications.signal_message_update(message_id, self._message_events)
+        return True
 
     async def add_chunk(self, message_id: str, chunk: str) -> bool:
         """
@@ -216,12 +305,101 @@ class QueueManager:
         Returns:
             True if successful, False otherwise
         """
-        async with self._lock:
-            message = self._messages.get(message_id)
-            if not message:
-                return False
-            message.chunks.append(chunk)
-            return True
+        # Only the worker processing a message writes its chunks, and the append
+        # never awaits, so no lock is needed on this per-token path
+        message = self._messages.get(message_id)
+        if not message:
+            return False
+        operations.append_chunk(message, chunk, self._max_in_memory_chunks)
+        # The chunk is readable immediately; subscribers are woken once per loop iteration
+        notifications.schedule_message_update(
+            message_id, self._message_events, self._pending_chunk_updates
+        )
+        return True
+
+    async def drain_chunks(self, message_id: str, since: int = 0) -> Tuple[List[str], int]:
+        """
+        Get the streaming chunks added to a message after a given sequence number.
+
+        Args:
+            message_id: The message ID
+            since: Sequence number of the first chunk the caller has not seen yet
+
+        Returns:
+            Tuple of (new chunks, next sequence number to pass as ``since``)
+        """
+        message = self._messages.get(message_id)
+        if not message:
+            return [], since
+        return operations.read_chunks_since(message, since), message.chunk_seq
+
+    def get_update_event(self, message_id: str) -> Optional[asyncio.Event]:
+        """
+        Get the event that fires on the next update to a message.
+
+        Subscribers should grab the event before reading the message so that
+        an update landing in between is never missed.
+
+        Args:
+            message_id: The message ID
+
+        Returns:
+            The pending update event, or None if no further updates will occur
+        """
+        return self._message_events.get(message_id)
+
+    async def wait_for_update(
+        self, update_event: Optional[asyncio.Event], timeout: float
+    ) -> bool:
+        """
+        Wait until a message is updated (new chunk, result or state change).
+
+        Args:
+            update_event: Event obtained from get_update_event
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if an update occurred, False if the timeout expired
+        """
+        return await notifications.wait_for_event(update_event, timeout)
+
+    def subscribe(self, message_id: str) -> None:
+        """
+        Register a streaming subscriber for a message.
+
+        Args:
+            message_id: The message ID
+        """
+        self._subscribers[message_id] = self._subscribers.get(message_id, 0) + 1
+
+    def unsubscribe(self, message_id: str) -> None:
+        """
+        Remove a streaming subscriber from a message.
+
+        Args:
+            message_id: The message ID
+        """
+        remaining = self._subscribers.get(message_id, 0) - 1
+        if remaining > 0:
+            self._subscribers[message_id] = remaining
+            return
+
+        self._subscribers.pop(message_id, None)
+        message = self._messages.get(message_id)
+        if message and state.is_terminal_state(message.state):
+            operations.release_chunks(message)
+
+    def has_subscribers(self, message_id: str) -> bool:
+        """
+        Check if any streaming subscriber is attached to a message.
+
+        Args:
+            message_id: The message ID
+
+        Returns:
+            True if at least one subscriber is attached
+        """
+        return message_id in self._subscribers
 
     async def get_queue_position(self, message_id: str) -> Optional[int]:
         """
@@ -233,15 +411,28 @@ class QueueManager:
         Returns:
             Queue position (0-indexed) or None if not in queue
         """
-        async with self._lock:
-            message = self._messages.get(message_id)
-            if not message or message.state != MessageState.QUEUED:
-                return None
+        queue_key = self._queue_keys.get(message_id)
+        if queue_key is None:
+            return None
+        return self._queued_index.index(queue_key)
 
-            message_priority_value = summary.calculate_message_priority_value(message.priority)
-            return summary.count_higher_priority_messages(
-                message_id, message_priority_value, message.created_at, self._messages
+    async def get_queue_positions(self, message_ids: List[str]) -> Dict[str, Optional[int]]:
+        """
+        Get the queue positions of several messages in one call.
+
+        Args:
+            message_ids: The message IDs
+
+        Returns:
+            Mapping of message ID to queue position (None if not in queue)
+        """
+        positions: Dict[str, Optional[int]] = {}
+        for message_id in message_ids:
+            queue_key = self._queue_keys.get(message_id)
+            positions[message_id] = (
+                self._queued_index.index(queue_key) if queue_key is not None else None
             )
+        return positions
 
     async def get_queue_summary(self) -> QueueSummaryResponse:
         """
@@ -250,38 +441,37 @@ class QueueManager:
         Returns:
             QueueSummaryResponse object
         """
-        async with self._lock:
-            state_counts = summary.count_messages_by_state(self._messages)
-            queued_messages = summary.build_queued_message_list(self._messages)
-            current_processing = summary.build_current_processing_message(self._messages)
-
-            return QueueSummaryResponse(
-                total_queued=state_counts[MessageState.QUEUED],
-                total_processing=state_counts[MessageState.PROCESSING],
-                total_completed=state_counts[MessageState.COMPLETED],
-                total_failed=state_counts[MessageState.FAILED],
-                total_cancelled=state_counts[MessageState.CANCELLED],
-                queued_messages=queued_messages,
-                current_processing=current_processing,
-            )
+        state_counts = self._state_counts
+        queued_messages = summary.build_queued_message_list(
+            self._queued_index, self._queued_entries
+        )
+        current_processing = summary.build_current_processing_message(self._processing)
+
+        return QueueSummaryResponse(
+            total_queued=state_counts[MessageState.QUEUED],
+            total_processing=state_counts[MessageState.PROCESSING],
+            total_completed=state_counts[MessageState.COMPLETED],
+            total_failed=state_counts[MessageState.FAILED],
+            total_cancelled=state_counts[MessageState.CANCELLED],
+            queued_messages=queued_messages,
+            current_processing=current_processing,
+        )
 
     # ============================================================================
     # Public API: Thread Operations
     # ============================================================================
 
-    async def wait_for_messages(self, thread_id: Optional[str] = None) -> None:
+    async def next_ready_thread(self) -> str:
         """
-        Wait until a new message is added to a thread's queue.
-        
-        Args:
-            thread_id: Optional thread ID to wait for. If None, waits for any thread.
+        Wait for a thread whose queue went from empty to non-empty.
+
+        Each such transition is recorded once, so a thread that became ready
+        before the call is returned immediately instead of being missed.
+
+        Returns:
+            ID of the thread that became ready
         """
-        if thread_id:
-            await threads.wait_for_specific_thread(
-                thread_id, self._thread_events, self._lock
-            )
-        else:
-            await threads.wait_for_any_thread(self._thread_events, self._lock)
+        return await threads.wait_for_ready_thread(self._ready_threads)
 
     def has_messages(self, thread_id: Optional[str] = None) -> bool:
         """
@@ -294,9 +484,9 @@ class QueueManager:
             True if there are messages, False otherwise
         """
         if thread_id:
-            return thread_id in self._thread_queues and not self._thread_queues[thread_id].empty()
-        else:
-            return len(self._active_threads) > 0
+            thread_queue = self._thread_queues.get(thread_id)
+            return thread_queue is not None and not thread_queue.empty()
+        return bool(self._active_threads)
     
     def get_active_threads(self) -> Set[str]:
         """
@@ -314,34 +504,66 @@ class QueueManager:
         Returns:
             Thread ID with pending messages, or None if no threads have messages
         """
-        async with self._lock:
-            if not self._active_threads:
-                return None
-            return next(iter(self._active_threads))
+        if not self._active_threads:
+            return None
+        return next(iter(self._active_threads))
 
-    async def get_thread_messages(self, thread_id: str) -> List[QueuedMessage]:
+    async def get_thread_messages(
+        self, thread_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[QueuedMessage]:
         """
-        Return all messages for a given thread sorted chronologically.
+        Return messages for a given thread sorted chronologically.
+
+        Only the requested page is materialized; callers that just need the
+        number of messages should read ThreadMetadata.message_count instead.
 
         Args:
             thread_id: The thread ID
+            limit: Maximum number of messages to return (None returns all)
+            offset: Number of leading messages to skip
 
         Returns:
             List of QueuedMessage objects sorted by creation time
         """
-        async with self._lock:
-            message_ids = self._thread_index.get(thread_id)
-            if not message_ids:
-                return []
+        message_ids = self._thread_index.get(thread_id)
+        if not message_ids:
+            return []
+
+        # The index is kept in insertion order, which is creation order
+        messages = (
+            self._messages[msg_id]
+            for msg_id in message_ids
+            if msg_id in self._messages
+        )
+        stop = None if limit is None else offset + limit
+        return list(itertools.islice(messages, offset, stop))
+
+    async def get_conversation_history(
+        self, thread_id: str, exclude_message_id: str
+    ) -> List[Tuple[str, str]]:
+        """
+        Return a thread's conversation as (role, content) turns.
+
+        Turns for finished messages are cached, so each call only builds
+        turns for messages that finished or arrived since the last one.
+
+        Args:
+            thread_id: The thread ID
+            exclude_message_id: Message to leave out (the one being answered)
 
-            messages = [
-                self._messages[msg_id]
-                for msg_id in message_ids
-                if msg_id in self._messages
-            ]
+        Returns:
+            List of (role, content) tuples in chronological order
+        """
+        message_ids = self._thread_index.get(thread_id)
+        if not message_ids:
+            return []
 
-            messages.sort(key=lambda msg: msg.created_at)
-            return messages
+        thread_history = self._thread_histories.get(thread_id)
+        if thread_history is None:
+            thread_history = self._thread_histories[thread_id] = history.ThreadHistory()
+        return history.build_thread_history(
+            thread_history, message_ids, self._messages, exclude_message_id
+        )
 
     async def get_thread_metadata(self, thread_id: str) -> Optional[ThreadMetadata]:
         """
@@ -353,11 +575,12 @@ class QueueManager:
         Returns:
             ThreadMetadata or None if thread doesn't exist
         """
-        async with self._lock:
-            metadata = self._thread_metadata.get(thread_id)
-            if not metadata:
-                return None
-            return metadata.model_copy(deep=True)
+        metadata = self._thread_metadata.get(thread_id)
+        if not metadata:
+            return None
+        # Every field but states is immutable, so a shallow copy with its own
+        # states dict keeps callers from mutating the live metadata
+        return metadata.model_copy(update={"states": dict(metadata.states)})
 
     async def list_threads(self) -> List[ThreadSummary]:
         """
@@ -366,40 +589,138 @@ class QueueManager:
         Returns:
             List of ThreadSummary objects sorted by last activity (most recent first)
         """
-        async with self._lock:
-            summaries: List[ThreadSummary] = []
-
-            for thread_id, metadata in self._thread_metadata.items():
-                message_ids = self._thread_index.get(thread_id, set())
-                messages = [
-                    self._messages[msg_id]
-                    for msg_id in message_ids
-                    if msg_id in self._messages
-                ]
-
-                last_message_preview = threads.extract_last_message_preview(messages)
-                summaries.append(
-                    ThreadSummary(
-                        thread_id=thread_id,
-                        message_count=metadata.message_count,
-                        created_at=metadata.created_at,
-                        last_activity=metadata.last_activity,
-                        last_message_preview=last_message_preview,
-                    )
+        summaries: List[ThreadSummary] = []
+
+        # Thread metadata is kept ordered by activity, oldest first
+        for thread_id, metadata in reversed(self._thread_metadata.items()):
+            summaries.append(
+                ThreadSummary(
+                    thread_id=thread_id,
+                    message_count=metadata.message_count,
+                    created_at=metadata.created_at,
+                    last_activity=metadata.last_activity,
+                    last_message_preview=self._thread_previews.get(thread_id),
                 )
+            )
 
-            summaries.sort(key=lambda summary: summary.last_activity, reverse=True)
-            return summaries
+        return summaries
 
     # ============================================================================
     # Internal Helpers: Thread State Management
     # ============================================================================
 
+    def _transition(
+        self,
+        message_id: str,
+        new_state: MessageState,
+        error: Optional[str] = None,
+        result: Optional[str] = None,
+    ) -> bool:
+        """Validate and apply a state change, then notify subscribers (must not await)."""
+        message = self._messages.get(message_id)
+        if not message:
+            logger.warning("Message not found for state update: id={}", message_id)
+            return False
+
+        if not state.validate_state_transition(message.state, new_state):
+            logger.warning(
+                "Invalid state transition: id={}, from={}, to={}",
+                message_id,
+                message.state,
+                new_state,
+            )
+            return False
+
+        if result is not None:
+            message.result = result
+
+        if message.state == MessageState.QUEUED:
+            # dequeue pops messages itself; a direct transition out of QUEUED
+            # must drop the ID from the thread queue too
+            operations.remove_from_queue(message, self._thread_queues, self._active_threads)
+
+        applied = state.apply_state_change(
+            message, new_state, error, message_id, self._update_thread_state_counts
+        )
+        final = state.is_terminal_state(new_state)
+        notifications.signal_message_update(message_id, self._message_events, final=final)
+        return applied
+
+    def _evict_expired_messages(self) -> None:
+        """Drop finished messages older than the retention window or beyond the count limit."""
+        finished = self._finished_messages
+        if self._max_finished_messages > 0:
+            while len(finished) > self._max_finished_messages:
+                self._evict_message(finished.popleft()[1])
+
+        if self._message_retention_seconds > 0:
+            cutoff = time.monotonic() - self._message_retention_seconds
+            while finished and finished[0][0] < cutoff:
+                self._evict_message(finished.popleft()[1])
+
+    def _evict_message(self, message_id: str) -> None:
+        """Remove a finished message and everything indexed by its ID."""
+        message = self._messages.pop(message_id, None)
+        if message is None:
+            return
+
+        self._state_counts[message.state] -= 1
+        threads.remove_message_from_thread(
+            message,
+            self._thread_index,
+            self._thread_metadata,
+            self._thread_previews,
+            self._messages,
+        )
+        # Cached turns are positional, so rebuild them on the next turn
+        self._thread_histories.pop(message.thread_id, None)
+        self._subscribers.pop(message_id, None)
+        self._message_events.pop(message_id, None)
+        logger.debug("Evicted finished message: id={}", message_id)
+
+        # A thread with nothing retained or queued is forgotten entirely, so
+        # memory does not grow with every thread ever created
+        thread_queue = self._thread_queues.get(message.thread_id)
+        if not self._thread_index.get(message.thread_id) and (
+            thread_queue is None or thread_queue.empty()
+        ):
+            self._remove_thread(message.thread_id)
+
+    def _remove_thread(self, thread_id: str) -> None:
+        """Drop every per-thread entry for a thread with no messages left."""
+        self._thread_index.pop(thread_id, None)
+        self._thread_metadata.pop(thread_id, None)
+        self._thread_previews.pop(thread_id, None)
+        self._thread_queues.pop(thread_id, None)
+        self._thread_histories.pop(thread_id, None)
+        self._active_threads.discard(thread_id)
+        logger.debug("Removed empty thread: thread_id={}", thread_id)
+
     def _update_thread_state_counts(
         self, message: QueuedMessage, old_state: MessageState, new_state: MessageState
     ) -> None:
-        """Update thread metadata when a message state changes."""
+        """Update thread metadata, state counts and the queue index when a message state changes."""
         threads.update_thread_state_counts(
             message, old_state, new_state, self._thread_metadata
         )
+        self._state_counts[old_state] -= 1
+        self._state_counts[new_state] += 1
+
+        if new_state == MessageState.PROCESSING:
+            self._processing[message.id] = message
+        elif old_state == MessageState.PROCESSING:
+            self._processing.pop(message.id, None)
+
+        if state.is_terminal_state(new_state):
+            self._finished_messages.append((time.monotonic(), message.id))
+            # Retained finished messages keep chunks only while a stream still reads them
+            if message.id not in self._subscribers:
+                operations.release_chunks(message)
+
+        # A message leaving the queue no longer has a position
+        if old_state == MessageState.QUEUED:
+            queue_key = self._queue_keys.pop(message.id, None)
+            if queue_key is not None:
+                self._queued_index.discard(queue_key)
+            self._queued_entries.pop(message.id, None)
 
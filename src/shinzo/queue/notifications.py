@@ -0,0 +1,73 @@
+"""Per-message update notifications for streaming subscribers."""
+
+import asyncio
+from typing import Dict, Optional, Set
+
+
+def create_message_event(message_id: str, message_events: Dict[str, asyncio.Event]) -> None:
+    """Create the update event for a newly enqueued message."""
+    message_events[message_id] = asyncio.Event()
+
+
+def signal_message_update(
+    message_id: str,
+    message_events: Dict[str, asyncio.Event],
+    final: bool = False,
+) -> None:
+    """
+    Wake every subscriber waiting on a message.
+
+    The fired event is replaced with a fresh one so later waiters block until
+    the next update. Once the message reaches a final state no new event is
+    created, and subscribers stop waiting.
+    """
+    event = message_events.pop(message_id, None)
+    if event is None:
+        return
+
+    event.set()
+    if not final:
+        message_events[message_id] = asyncio.Event()
+
+
+def schedule_message_update(
+    message_id: str,
+    message_events: Dict[str, asyncio.Event],
+    pending_updates: Set[str],
+) -> None:
+    """
+    Wake subscribers on the next event-loop iteration.
+
+    Bursts of updates within one iteration (e.g. several streamed chunks)
+    collapse into a single wake-up, so subscribers are woken and a new event
+    is allocated once per burst rather than once per update.
+    """
+    if message_id in pending_updates:
+        return
+
+    pending_updates.add(message_id)
+    asyncio.get_running_loop().call_soon(
+        _flush_message_update, message_id, message_events, pending_updates
+    )
+
+
+def _flush_message_update(
+    message_id: str,
+    message_events: Dict[str, asyncio.Event],
+    pending_updates: Set[str],
+) -> None:
+    """Deliver a wake-up scheduled by schedule_message_update."""
+    pending_updates.discard(message_id)
+    signal_message_update(message_id, message_events)
+
+
+async def wait_for_event(event: Optional[asyncio.Event], timeout: float) -> bool:
+    """Wait for an update event, returning False if the timeout expires first."""
+    if event is None:
+        return True
+
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
@@ -1,10 +1,13 @@
 """Queue operations helpers for enqueue/dequeue operations."""
 
 import asyncio
+from collections import deque
 from datetime import datetime
-from typing import Dict, Optional
+from itertools import islice
+from typing import Dict, List, Optional
 
 from shinzo.models import QueuedMessage, MessageState, Priority, PRIORITY_MAP
+from shinzo.queue.buckets import PriorityBuckets
 from shinzo.utils import get_logger
 
 
@@ -15,76 +18,83 @@ def create_message(
     user_message: str, thread_id: str, priority: Priority
 ) -> QueuedMessage:
     """Create a new QueuedMessage object."""
+    created_at = datetime.utcnow()
     return QueuedMessage(
         user_message=user_message,
         priority=priority,
+        priority_value=PRIORITY_MAP[priority],
         state=MessageState.QUEUED,
         thread_id=thread_id,
+        created_at=created_at,
+        created_at_iso=created_at.isoformat(),
     )
 
 
 def ensure_thread_resources(
     thread_id: str,
-    thread_queues: Dict[str, asyncio.PriorityQueue],
-    thread_events: Dict[str, asyncio.Event],
+    thread_queues: Dict[str, PriorityBuckets],
 ) -> None:
-    """Ensure thread has a queue and event initialized."""
+    """Ensure thread has a queue initialized."""
     if thread_id not in thread_queues:
-        thread_queues[thread_id] = asyncio.PriorityQueue()
-        thread_events[thread_id] = asyncio.Event()
+        thread_queues[thread_id] = PriorityBuckets()
 
 
-async def add_message_to_queue(
+def add_message_to_queue(
     thread_id: str,
-    priority: Priority,
-    message_id: str,
-    thread_queues: Dict[str, asyncio.PriorityQueue],
-    insertion_order_counter: int,
-) -> int:
-    """
-    Add message to thread's priority queue.
-    
-    Returns:
-        Updated insertion_order_counter
-    """
-    priority_value = PRIORITY_MAP[priority]
-    await thread_queues[thread_id].put(
-        (priority_value, insertion_order_counter, message_id)
-    )
-    return insertion_order_counter + 1
+    message: QueuedMessage,
+    thread_queues: Dict[str, PriorityBuckets],
+) -> None:
+    """Add message to the thread's bucket for its priority."""
+    thread_queues[thread_id].put(message.priority_value, message.id)
 
 
 def log_message_enqueued(
     message: QueuedMessage,
     thread_id: str,
-    thread_queues: Dict[str, asyncio.PriorityQueue],
+    thread_queues: Dict[str, PriorityBuckets],
 ) -> None:
     """Log message enqueue operation."""
-    queue_size = thread_queues[thread_id].qsize()
     logger.info(
-        f"Message enqueued: id={message.id}, thread_id={thread_id}, "
-        f"priority={message.priority}, thread_queue_size={queue_size}"
+        "Message enqueued: id={}, thread_id={}, priority={}, thread_queue_size={}",
+        message.id,
+        thread_id,
+        message.priority,
+        thread_queues[thread_id].qsize(),
     )
 
 
-def signal_thread_message_available(
-    thread_id: str, thread_events: Dict[str, asyncio.Event]
+def signal_thread_ready(
+    thread_id: str, active_threads: set, ready_threads: "asyncio.Queue[str]"
+) -> None:
+    """Mark a thread active, queueing it for the coordinator if it was idle."""
+    if thread_id not in active_threads:
+        active_threads.add(thread_id)
+        ready_threads.put_nowait(thread_id)
+
+
+def remove_from_queue(
+    message: QueuedMessage,
+    thread_queues: Dict[str, PriorityBuckets],
+    active_threads: set,
 ) -> None:
-    """Signal that a new message is available for a thread."""
-    thread_events[thread_id].set()
+    """Drop a cancelled message from its thread queue so no worker wakes for it."""
+    thread_queue = thread_queues.get(message.thread_id)
+    if thread_queue is None or not thread_queue.remove(message.priority_value, message.id):
+        return
+
+    if thread_queue.empty():
+        active_threads.discard(message.thread_id)
 
 
-async def process_dequeued_message(
+def pop_next_queued_message(
     thread_id: str,
-    thread_queue: asyncio.PriorityQueue,
-    message_id: str,
+    thread_queue: PriorityBuckets,
     messages: Dict[str, QueuedMessage],
     active_threads: set,
-    lock: asyncio.Lock,
     update_thread_state_counts,
 ) -> Optional[QueuedMessage]:
-    """Process a dequeued message and return it if valid."""
-    async with lock:
+    """Pop the next still-queued message, skipping cancelled ones."""
+    while (message_id := thread_queue.get_nowait()) is not None:
         message = messages.get(message_id)
 
         if message and message.state == MessageState.QUEUED:
@@ -92,15 +102,17 @@ async def process_dequeued_message(
                 thread_id, thread_queue, message, active_threads, update_thread_state_counts
             )
         elif message and message.state == MessageState.CANCELLED:
-            return handle_cancelled_message(thread_id, thread_queue, message, active_threads)
+            logger.info("Skipping cancelled message: id={}", message.id)
         else:
-            logger.warning(f"Message not found or invalid state: id={message_id}")
-            return None
+            logger.warning("Message not found or invalid state: id={}", message_id)
+
+    active_threads.discard(thread_id)
+    return None
 
 
 def handle_valid_dequeued_message(
     thread_id: str,
-    thread_queue: asyncio.PriorityQueue,
+    thread_queue: PriorityBuckets,
     message: QueuedMessage,
     active_threads: set,
     update_thread_state_counts,
@@ -115,21 +127,36 @@ def handle_valid_dequeued_message(
     if thread_queue.empty():
         active_threads.discard(thread_id)
 
-    logger.info(f"Message dequeued: id={message.id}, thread_id={thread_id}")
+    logger.info("Message dequeued: id={}, thread_id={}", message.id, thread_id)
     return message
 
 
-def handle_cancelled_message(
-    thread_id: str,
-    thread_queue: asyncio.PriorityQueue,
-    message: QueuedMessage,
-    active_threads: set,
-) -> Optional[QueuedMessage]:
-    """Handle a cancelled message by skipping it."""
-    logger.info(f"Skipping cancelled message: id={message.id}")
-    
-    if thread_queue.empty():
-        active_threads.discard(thread_id)
-    
-    return None
+def append_chunk(message: QueuedMessage, chunk: str, max_chunks: int) -> None:
+    """
+    Append a streaming chunk, keeping at most ``max_chunks`` in memory.
 
+    The oldest chunks are released first. Subscribers drain chunks as they
+    arrive, so only a reader that falls far behind ever misses any; the
+    complete text is still delivered with the final result. The buffer is
+    only allocated once a message actually streams.
+    """
+    if message.chunks is None:
+        message.chunks = deque(maxlen=max_chunks)
+    message.chunks.append(chunk)
+    message.chunk_seq += 1
+
+
+def release_chunks(message: QueuedMessage) -> None:
+    """Drop a finished message's buffered chunks; its result holds the full text."""
+    message.chunks = None
+
+
+def read_chunks_since(message: QueuedMessage, since: int) -> List[str]:
+    """Return the chunks added after sequence number ``since`` without rescanning older ones."""
+    if not message.chunks:
+        return []
+    unread = min(message.chunk_seq - since, len(message.chunks))
+    if unread <= 0:
+        return []
+    # Walk from the right so the cost is proportional to the unread chunks only
+    return list(islice(reversed(message.chunks), unread))[::-1]
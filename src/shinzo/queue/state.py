@@ -10,24 +10,32 @@ from shinzo.utils import get_logger
 logger = get_logger(__name__)
 
 
+# Allowed (current, new) state pairs; finished states have no outgoing transitions
+VALID_TRANSITIONS = frozenset({
+    (MessageState.QUEUED, MessageState.PROCESSING),
+    (MessageState.QUEUED, MessageState.CANCELLED),
+    (MessageState.PROCESSING, MessageState.COMPLETED),
+    (MessageState.PROCESSING, MessageState.FAILED),
+})
+
+
 def validate_state_transition(current: MessageState, new: MessageState) -> bool:
     """Validate if state transition is allowed."""
-    valid_transitions = {
-        MessageState.QUEUED: [MessageState.PROCESSING, MessageState.CANCELLED],
-        MessageState.PROCESSING: [MessageState.COMPLETED, MessageState.FAILED],
-        MessageState.COMPLETED: [],
-        MessageState.FAILED: [],
-        MessageState.CANCELLED: [],
-    }
-    return new in valid_transitions.get(current, [])
+    return (current, new) in VALID_TRANSITIONS
+
+
+def is_terminal_state(state: MessageState) -> bool:
+    """Check if a state is final (no further transitions allowed)."""
+    return state in (MessageState.COMPLETED, MessageState.FAILED, MessageState.CANCELLED)
 
 
 def update_message_timestamps(message: QueuedMessage, new_state: MessageState) -> None:
     """Update message timestamps based on state transition."""
     if new_state == MessageState.PROCESSING:
         message.started_at = datetime.utcnow()
-    elif new_state in [MessageState.COMPLETED, MessageState.FAILED, MessageState.CANCELLED]:
+    elif is_terminal_state(new_state):
         message.completed_at = datetime.utcnow()
+        message.completed_at_iso = message.completed_at.isoformat()
 
 
 def apply_state_change(
@@ -60,8 +68,10 @@ def apply_state_change(
     update_thread_state_counts(message, old_state, new_state)
 
     logger.info(
-        f"Message state updated: id={message_id}, "
-        f"from={old_state}, to={new_state}"
+        "Message state updated: id={}, from={}, to={}",
+        message_id,
+        old_state,
+        new_state,
     )
 
     return True
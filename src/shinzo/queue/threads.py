@@ -2,7 +2,7 @@
 
 import asyncio
 from datetime import datetime
-from typing import Dict, Set, List, Optional
+from typing import Dict, Optional
 
 from shinzo.models import QueuedMessage, MessageState, ThreadMetadata, ThreadSummary
 
@@ -10,12 +10,13 @@ from shinzo.models import QueuedMessage, MessageState, ThreadMetadata, ThreadSum
 def initialize_or_update_thread_metadata(
     thread_id: str,
     message: QueuedMessage,
-    thread_index: Dict[str, Set[str]],
+    thread_index: Dict[str, Dict[str, None]],
     thread_metadata: Dict[str, ThreadMetadata],
+    thread_previews: Dict[str, Optional[str]],
 ) -> None:
     """Initialize and update thread metadata for a message."""
     if thread_id not in thread_index:
-        thread_index[thread_id] = set()
+        thread_index[thread_id] = {}
         thread_metadata[thread_id] = ThreadMetadata(
             thread_id=thread_id,
             message_count=0,
@@ -24,12 +25,15 @@ def initialize_or_update_thread_metadata(
             states={state: 0 for state in MessageState},
         )
 
-    thread_index[thread_id].add(message.id)
+    thread_index[thread_id][message.id] = None
 
     metadata = thread_metadata[thread_id]
+    mark_thread_active(thread_id, thread_metadata)
     metadata.message_count += 1
     metadata.last_activity = message.created_at
-    metadata.states[message.state] = metadata.states.get(message.state, 0) + 1
+    metadata.last_message_id = message.id
+    metadata.states[message.state] += 1
+    thread_previews[thread_id] = format_message_preview(message)
 
 
 def update_thread_state_counts(
@@ -46,63 +50,62 @@ def update_thread_state_counts(
     if not metadata:
         return
 
-    metadata.states[old_state] = max(
-        0, metadata.states.get(old_state, 0) - 1
+    # Every state has a count from creation, and transitions are validated
+    # before they are applied, so counts can be adjusted in place
+    metadata.states[old_state] -= 1
+    metadata.states[new_state] += 1
+    # Reuse the timestamp the transition just recorded instead of reading the clock again
+    activity_at = (
+        message.started_at if new_state == MessageState.PROCESSING else message.completed_at
     )
-    metadata.states[new_state] = metadata.states.get(new_state, 0) + 1
-    metadata.last_activity = datetime.utcnow()
+    metadata.last_activity = activity_at or datetime.utcnow()
+    mark_thread_active(message.thread_id, thread_metadata)
 
 
-async def ensure_thread_event(
-    thread_id: str,
-    thread_events: Dict[str, asyncio.Event],
-    lock: asyncio.Lock,
-) -> None:
-    """Ensure a thread event exists, creating it if necessary."""
-    if thread_id not in thread_events:
-        async with lock:
-            if thread_id not in thread_events:
-                thread_events[thread_id] = asyncio.Event()
+def mark_thread_active(thread_id: str, thread_metadata: Dict[str, ThreadMetadata]) -> None:
+    """
+    Move a thread to the end of the metadata dict.
 
+    Called whenever a thread's last_activity advances, this keeps the dict
+    ordered from least to most recently active, so listings need no sort.
+    """
+    thread_metadata[thread_id] = thread_metadata.pop(thread_id)
 
-async def wait_for_specific_thread(
-    thread_id: str,
-    thread_events: Dict[str, asyncio.Event],
-    lock: asyncio.Lock,
+
+def remove_message_from_thread(
+    message: QueuedMessage,
+    thread_index: Dict[str, Dict[str, None]],
+    thread_metadata: Dict[str, ThreadMetadata],
+    thread_previews: Dict[str, Optional[str]],
+    messages: Dict[str, QueuedMessage],
 ) -> None:
-    """Wait for a specific thread to have messages."""
-    await ensure_thread_event(thread_id, thread_events, lock)
-    await thread_events[thread_id].wait()
-    thread_events[thread_id].clear()
+    """Remove an evicted message from its thread's index, counts and preview."""
+    message_ids = thread_index.get(message.thread_id)
+    if message_ids is not None:
+        message_ids.pop(message.id, None)
 
+    metadata = thread_metadata.get(message.thread_id)
+    if metadata:
+        metadata.message_count = max(0, metadata.message_count - 1)
+        metadata.states[message.state] -= 1
 
-async def wait_for_any_thread(
-    thread_events: Dict[str, asyncio.Event],
-    lock: asyncio.Lock,
-) -> None:
-    """Wait for any thread to have messages."""
-    async with lock:
-        if not thread_events:
-            await asyncio.sleep(0.1)
-            return
-        events = list(thread_events.values())
-    
-    if events:
-        done, pending = await asyncio.wait(
-            [asyncio.create_task(event.wait()) for event in events],
-            return_when=asyncio.FIRST_COMPLETED
-        )
-        for task in pending:
-            task.cancel()
+        if metadata.last_message_id == message.id:
+            # Point at the newest message still retained
+            newest = messages.get(next(reversed(message_ids), None)) if message_ids else None
+            metadata.last_message_id = newest.id if newest else None
+            thread_previews[message.thread_id] = (
+                format_message_preview(newest) if newest else None
+            )
+
+
+async def wait_for_ready_thread(ready_threads: "asyncio.Queue[str]") -> str:
+    """Wait for the next thread that went from empty to non-empty."""
+    return await ready_threads.get()
 
 
-def extract_last_message_preview(messages: List[QueuedMessage]) -> Optional[str]:
-    """Extract preview text from the most recent message."""
-    if not messages:
-        return None
-    
-    last_message = max(messages, key=lambda msg: msg.created_at)
-    preview_text = last_message.user_message
+def format_message_preview(message: QueuedMessage) -> str:
+    """Truncate a message's text for thread listings."""
+    preview_text = message.user_message
     if len(preview_text) > 100:
         preview_text = preview_text[:97] + "..."
     return preview_text
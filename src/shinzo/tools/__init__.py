@@ -1,12 +1,47 @@
 """Custom tools for the LangGraph agent"""
 
-from typing import Any, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 import yfinance as yf
 from langchain_core.tools import tool
 from shinzo.utils import get_logger
 
 logger = get_logger(__name__)
 
+# Company info is fetched over HTTP and changes slowly, so successful lookups
+# are reused for a few minutes across conversations
+COMPANY_INFO_TTL_SECONDS = 300.0
+COMPANY_INFO_CACHE_SIZE = 512
+
+# ticker -> (expiry on the monotonic clock, company data); tools run in
+# executor threads, so access is guarded by a lock
+_company_info_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_company_info_lock = threading.Lock()
+
+
+def _get_cached_company_info(ticker: str) -> Optional[Dict[str, Any]]:
+    """Return cached company data for a ticker, or None if missing or expired."""
+    with _company_info_lock:
+        entry = _company_info_cache.get(ticker)
+        if entry is None:
+            return None
+        expires_at, company_data = entry
+        if expires_at <= time.monotonic():
+            del _company_info_cache[ticker]
+            return None
+        return company_data
+
+
+def _cache_company_info(ticker: str, company_data: Dict[str, Any]) -> None:
+    """Store company data for a ticker, dropping the oldest entry when full."""
+    with _company_info_lock:
+        _company_info_cache[ticker] = (time.monotonic() + COMPANY_INFO_TTL_SECONDS, company_data)
+        _company_info_cache.move_to_end(ticker)
+        if len(_company_info_cache) > COMPANY_INFO_CACHE_SIZE:
+            _company_info_cache.popitem(last=False)
+
 
 @tool
 def get_company_info(ticker: str) -> Dict[str, Any]:
@@ -20,6 +55,11 @@ def get_company_info(ticker: str) -> Dict[str, Any]:
         A dictionary containing company information including name, sector, 
         industry, market cap, description, and key financial metrics.
     """
+    cached = _get_cached_company_info(ticker.upper())
+    if cached is not None:
+        logger.info(f"Using cached company info for ticker: {ticker}")
+        return cached
+
     try:
         logger.info(f"Fetching company info for ticker: {ticker}")
         
@@ -62,6 +102,7 @@ def get_company_info(ticker: str) -> Dict[str, Any]:
         }
         
         logger.info(f"Successfully fetched info for {company_data['name']} ({ticker})")
+        _cache_company_info(company_data["ticker"], company_data)
         return company_data
         
     except Exception as e:
@@ -30,7 +30,8 @@ def setup_logging():
         level=settings.log_level.upper(),  # Change to DEBUG for verbose output
         colorize=True,
         backtrace=True,  # Show error backtraces for easier debugging
-        # diagnose=True,   # Show variable values in tracebacks
+        diagnose=False,  # Don't inspect variable values in tracebacks (slow, may leak secrets)
+        enqueue=True,  # Format and write records on a background thread, off the event loop
         # catch=True,      # Catch exceptions and show full traceback
     )
 
@@ -1,7 +1,8 @@
 """Coordinator logic for managing thread workers."""
 
 import asyncio
-from typing import Dict, Optional
+import functools
+from typing import Dict
 
 from shinzo.queue import QueueManager
 from shinzo.agent import AgentProcessor
@@ -12,63 +13,68 @@ from shinzo.utils import get_logger
 logger = get_logger(__name__)
 
 
+def _reap_worker(
+    thread_id: str, thread_tasks: Dict[str, asyncio.Task], task: asyncio.Task
+) -> None:
+    """Drop a finished thread worker from the task map and log its failure, if any."""
+    # The thread may already have a replacement worker
+    if thread_tasks.get(thread_id) is task:
+        del thread_tasks[thread_id]
+
+    if not task.cancelled() and task.exception() is not None:
+        logger.opt(exception=task.exception()).error(
+            "Thread worker error for {}: {}", thread_id, task.exception()
+        )
+    logger.info("Cleaned up worker for thread: {}", thread_id)
+
+
 async def run_coordinator(
     running_check,
-    lock: asyncio.Lock,
     thread_tasks: Dict[str, asyncio.Task],
     queue_manager: QueueManager,
     agent_processor: AgentProcessor,
+    agent_semaphore: asyncio.Semaphore,
 ):
     """Main coordinator loop that spawns workers for each thread"""
     logger.info("Worker coordinator loop started")
 
     while running_check():
         try:
-            # Get all active threads
-            active_threads = queue_manager.get_active_threads()
-
-            # Start workers for new threads
-            async with lock:
-                for thread_id in active_threads:
-                    if thread_id not in thread_tasks:
-                        # Start a new worker for this thread
-                        task = asyncio.create_task(
-                            process_thread(
-                                thread_id, running_check, queue_manager, agent_processor
-                            )
-                        )
-                        thread_tasks[thread_id] = task
-                        logger.info(f"Started worker for thread: {thread_id}")
-
-                # Clean up completed thread tasks
-                completed_threads = []
-                for thread_id, task in thread_tasks.items():
-                    if task.done():
-                        completed_threads.append(thread_id)
-                        try:
-                            # Get exception if any
-                            task.result()
-                        except asyncio.CancelledError:
-                            pass
-                        except Exception as e:
-                            logger.error(
-                                f"Thread worker error for {thread_id}: {e}",
-                                exc_info=True
-                            )
-
-                for thread_id in completed_threads:
-                    del thread_tasks[thread_id]
-                    logger.info(f"Cleaned up worker for thread: {thread_id}")
-
-            # Wait a bit before checking for new threads
-            await asyncio.sleep(0.5)
+            # Sleep until a thread's queue goes from empty to non-empty; only
+            # that thread can need a new worker
+            thread_id = await queue_manager.next_ready_thread()
+
+            # Nothing below awaits, so this step is atomic on the event loop and
+            # thread_tasks needs no lock. The thread's messages may already have
+            # been cancelled or taken by a worker that is still running.
+            if not queue_manager.has_messages(thread_id):
+                continue
+
+            # A worker that just exited may not have been reaped yet; replace it
+            existing = thread_tasks.get(thread_id)
+            if existing is None or existing.done():
+                # Start a new worker for this thread
+                task = asyncio.create_task(
+                    process_thread(
+                        thread_id,
+                        running_check,
+                        queue_manager,
+                        agent_processor,
+                        agent_semaphore,
+                    )
+                )
+                task.add_done_callback(
+                    functools.partial(_reap_worker, thread_id, thread_tasks)
+                )
+                thread_tasks[thread_id] = task
+                logger.info("Started worker for thread: {}", thread_id)
 
         except asyncio.CancelledError:
             logger.info("Worker coordinator cancelled")
             break
 
         except Exception as e:
-            logger.error(f"Worker coordinator error: {e}", exc_info=True)
+            logger.exception("Worker coordinator error: {}", e)
             await asyncio.sleep(1.0)
 
     logger.info("Worker coordinator loop ended")
@@ -5,6 +5,7 @@ from typing import Optional, Dict
 
 from shinzo.queue import QueueManager
 from shinzo.agent import AgentProcessor
+from shinzo.config import settings
 from shinzo.worker.coordinator import run_coordinator
 from shinzo.utils import get_logger
 
@@ -21,7 +22,8 @@ class Worker:
         self._running = False
         self._main_task: Optional[asyncio.Task] = None
         self._thread_tasks: Dict[str, asyncio.Task] = {}
-        self._lock = asyncio.Lock()
+        # Caps agent calls in flight across all thread workers
+        self._agent_semaphore = asyncio.Semaphore(settings.max_concurrent_agents)
 
     async def start(self):
         """Start the worker task"""
@@ -33,10 +35,10 @@ class Worker:
         self._main_task = asyncio.create_task(
             run_coordinator(
                 lambda: self._running,
-                self._lock,
                 self._thread_tasks,
                 self.queue_manager,
-                self.agent_processor
+                self.agent_processor,
+                self._agent_semaphore,
             )
         )
         logger.info("Worker coordinator started")
@@ -49,29 +51,23 @@ class Worker:
         logger.info("Stopping worker coordinator...")
         self._running = False
 
-        # Stop all thread workers
-        async with self._lock:
-            thread_tasks = list(self._thread_tasks.values())
-            self._thread_tasks.clear()
-
-        for task in thread_tasks:
-            task.cancel()
+        # Stop main coordinator first so it cannot start new thread workers; it
+        # sleeps until the next enqueue, so cancel it rather than waiting for it
+        # to notice the stop flag
+        if self._main_task:
+            self._main_task.cancel()
             try:
-                await task
+                await self._main_task
             except asyncio.CancelledError:
                 pass
 
-        # Stop main coordinator
-        if self._main_task:
-            try:
-                await asyncio.wait_for(self._main_task, timeout=10.0)
-            except asyncio.TimeoutError:
-                logger.warning("Worker coordinator did not stop gracefully, cancelling...")
-                self._main_task.cancel()
-                try:
-                    await self._main_task
-                except asyncio.CancelledError:
-                    pass
+        # Stop all thread workers, letting them unwind concurrently
+        thread_tasks = list(self._thread_tasks.values())
+        self._thread_tasks.clear()
+
+        for task in thread_tasks:
+            task.cancel()
+        await asyncio.gather(*thread_tasks, return_exceptions=True)
 
         logger.info("Worker stopped")
 
@@ -14,6 +14,7 @@ async def process_thread(
     running_check,
     queue_manager: QueueManager,
     agent_processor: AgentProcessor,
+    agent_semaphore: asyncio.Semaphore,
 ):
     """
     Process messages for a specific thread
@@ -23,48 +24,54 @@ async def process_thread(
         running_check: Callable that returns True if worker is running
         queue_manager: Queue manager instance
         agent_processor: Agent processor instance
+        agent_semaphore: Semaphore bounding concurrent agent calls across threads
     """
-    logger.info(f"Thread worker started for: {thread_id}")
+    logger.info("Thread worker started for: {}", thread_id)
 
     while running_check():
         try:
             # Check if thread has messages
             if queue_manager.has_messages(thread_id):
-                # Dequeue next message from this thread
-                message = await queue_manager.dequeue(thread_id)
+                # Wait for an agent slot before dequeuing so the message keeps
+                # its queue position while other threads hold every slot
+                async with agent_semaphore:
+                    # Dequeue next message from this thread
+                    message = await queue_manager.dequeue(thread_id)
 
-                if message:
-                    logger.info(
-                        f"Thread worker processing message: thread_id={thread_id}, "
-                        f"message_id={message.id}, priority={message.priority}"
+                    if not message:
+                        # Only cancelled messages were left; re-check the queue
+                        continue
+
+                    # The processor logs each message at INFO; these only add the worker's view
+                    logger.debug(
+                        "Thread worker processing message: "
+                        "thread_id={}, message_id={}, priority={}",
+                        thread_id,
+                        message.id,
+                        message.priority,
                     )
 
                     # Process the message
                     await agent_processor.process_message(message)
 
-                    logger.info(
-                        f"Thread worker completed message: thread_id={thread_id}, "
-                        f"message_id={message.id}"
-                    )
-                else:
-                    # Message was None (e.g., cancelled), continue to next
-                    continue
+                logger.debug(
+                    "Thread worker completed message: thread_id={}, message_id={}",
+                    thread_id,
+                    message.id,
+                )
             else:
                 # Thread queue is empty, exit this worker
-                logger.info(f"Thread queue empty, worker exiting for: {thread_id}")
+                logger.info("Thread queue empty, worker exiting for: {}", thread_id)
                 break
 
         except asyncio.CancelledError:
-            logger.info(f"Thread worker cancelled for: {thread_id}")
+            logger.info("Thread worker cancelled for: {}", thread_id)
             break
 
         except Exception as e:
-            logger.error(
-                f"Thread worker error for {thread_id}: {e}",
-                exc_info=True
-            )
+            logger.exception("Thread worker error for {}: {}", thread_id, e)
             # Continue processing despite error
             await asyncio.sleep(1.0)
 
-    logger.info(f"Thread worker ended for: {thread_id}")
+    logger.info("Thread worker ended for: {}", thread_id)
 
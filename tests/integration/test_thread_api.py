@@ -48,6 +48,13 @@ async def test_thread_lifecycle_endpoints(api_client):
     assert first_data["message_id"] in returned_ids
     assert second_data["message_id"] in returned_ids
 
+    # Page through thread messages
+    page_resp = await api_client.get(f"/threads/{thread_id}/messages?limit=1&offset=1")
+    assert page_resp.status_code == 200
+    page = page_resp.json()
+    assert page["total_messages"] == 2
+    assert [msg["message_id"] for msg in page["messages"]] == [second_data["message_id"]]
+
 
 @pytest.mark.asyncio
 async def test_thread_not_found_returns_404(api_client):
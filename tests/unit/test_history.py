@@ -0,0 +1,24 @@
+from shinzo.agent.history import apply_history_window
+
+
+def test_apply_history_window_keeps_recent_exchanges():
+    """Test that the window keeps whole exchanges starting on a user turn"""
+    messages = [
+        ("user", "one"),
+        ("assistant", "reply one"),
+        ("user", "two"),
+        ("user", "three"),
+        ("assistant", "reply three"),
+    ]
+
+    assert apply_history_window(messages, 0) == messages
+    assert apply_history_window(messages, 10) == messages
+    assert apply_history_window(messages, 2) == [
+        ("user", "two"),
+        ("user", "three"),
+        ("assistant", "reply three"),
+    ]
+    assert apply_history_window(messages, 1) == [
+        ("user", "three"),
+        ("assistant", "reply three"),
+    ]
@@ -7,6 +7,7 @@ from shinzo.models import (
     MessageSubmitRequest,
     SSEEvent,
     PRIORITY_MAP,
+    format_chunk_event,
 )
 
 
@@ -45,7 +46,8 @@ def test_queued_message_creation():
     assert message.completed_at is None
     assert message.result is None
     assert message.error is None
-    assert message.chunks == []
+    assert message.chunks is None
+    assert message.chunk_seq == 0
 
 
 def test_queued_message_with_priority():
@@ -86,10 +88,11 @@ def test_sse_event_format():
 
     formatted = event.format()
 
-    assert "event: test" in formatted
-    assert '"message": "hello"' in formatted or '"message":"hello"' in formatted
-    assert '"count": 42' in formatted or '"count":42' in formatted
-    assert formatted.endswith("\n")
+    assert isinstance(formatted, bytes)
+    assert b"event: test" in formatted
+    assert b'"message": "hello"' in formatted or b'"message":"hello"' in formatted
+    assert b'"count": 42' in formatted or b'"count":42' in formatted
+    assert formatted.endswith(b"\n\n")
 
 
 def test_sse_event_without_event_type():
@@ -100,5 +103,16 @@ def test_sse_event_without_event_type():
 
     formatted = event.format()
 
-    assert "event:" not in formatted or formatted.count("event:") == 0 or "event: None" not in formatted
-    assert "data:" in formatted
+    assert b"event:" not in formatted
+    assert formatted.startswith(b"data:")
+
+
+def test_format_chunk_event_matches_sse_event():
+    """Test the chunk fast path produces the same frame as SSEEvent"""
+    chunk = 'say "hi"\n'
+    expected = SSEEvent(
+        event="chunk",
+        data={"type": "content", "chunk": chunk, "index": 3, "count": 2},
+    ).format()
+
+    assert format_chunk_event(chunk, 3, 2) == expected
@@ -1,6 +1,7 @@
+import asyncio
 import pytest
 from shinzo.queue import QueueManager
-from shinzo.models import Priority, MessageState
+from shinzo.models import Priority, MessageState, PRIORITY_MAP
 
 
 @pytest.mark.asyncio
@@ -13,6 +14,7 @@ async def test_enqueue_message():
     assert message.id is not None
     assert message.user_message == "Test message"
     assert message.priority == Priority.NORMAL
+    assert message.priority_value == PRIORITY_MAP[Priority.NORMAL]
     assert message.state == MessageState.QUEUED
     assert message.thread_id == "thread-1"
 
@@ -131,6 +133,23 @@ async def test_cancel_queued_message():
     assert updated.completed_at is not None
 
 
+@pytest.mark.asyncio
+async def test_cancelled_message_leaves_thread_queue():
+    """Test that cancelling removes the message so workers are not woken for it"""
+    qm = QueueManager()
+
+    first = await qm.enqueue("First", thread_id="thread-1")
+    second = await qm.enqueue("Second", thread_id="thread-1")
+
+    await qm.cancel_message(first.id)
+    assert qm.has_messages("thread-1") is True
+
+    await qm.cancel_message(second.id)
+    assert qm.has_messages("thread-1") is False
+    assert "thread-1" not in qm.get_active_threads()
+    assert await qm.dequeue("thread-1") is None
+
+
 @pytest.mark.asyncio
 async def test_cannot_cancel_processing_message():
     """Test that processing messages cannot be cancelled"""
@@ -204,6 +223,222 @@ async def test_add_chunk():
     assert updated.chunks[1] == "chunk2"
 
 
+@pytest.mark.asyncio
+async def test_drain_chunks_since_sequence():
+    """Test reading only the chunks added after a sequence number"""
+    qm = QueueManager()
+
+    message = await qm.enqueue("Test", thread_id="thread-1")
+
+    await qm.add_chunk(message.id, "a")
+    await qm.add_chunk(message.id, "b")
+
+    chunks, seq = await qm.drain_chunks(message.id)
+    assert chunks == ["a", "b"]
+    assert seq == 2
+
+    await qm.add_chunk(message.id, "c")
+
+    chunks, seq = await qm.drain_chunks(message.id, since=seq)
+    assert chunks == ["c"]
+    assert seq == 3
+
+    # Nothing new since the last read
+    chunks, seq = await qm.drain_chunks(message.id, since=seq)
+    assert chunks == []
+    assert seq == 3
+
+
+@pytest.mark.asyncio
+async def test_complete_sets_result_and_state():
+    """Test completing a message stores the result and final state together"""
+    qm = QueueManager()
+
+    message = await qm.enqueue("Test", thread_id="thread-1")
+    update_event = qm.get_update_event(message.id)
+
+    # Only processing messages can complete
+    assert await qm.complete(message.id, "too early") is False
+
+    await qm.update_state(message.id, MessageState.PROCESSING)
+    assert await qm.complete(message.id, "Done") is True
+
+    completed = await qm.get_message(message.id)
+    assert completed.state == MessageState.COMPLETED
+    assert completed.result == "Done"
+    assert completed.completed_at is not None
+    assert update_event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_get_light_status():
+    """Test reading a message's state, completion time and error"""
+    qm = QueueManager()
+
+    message = await qm.enqueue("Test", thread_id="thread-1")
+    assert await qm.get_light_status(message.id) == (MessageState.QUEUED, None, None)
+
+    await qm.update_state(message.id, MessageState.PROCESSING)
+    await qm.update_state(message.id, MessageState.FAILED, error="boom")
+
+    state, completed_at, error = await qm.get_light_status(message.id)
+    assert state == MessageState.FAILED
+    assert completed_at == (await qm.get_message(message.id)).completed_at.isoformat()
+    assert error == "boom"
+
+    assert await qm.get_light_status("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_chunk_buffer_is_bounded():
+    """Test only the most recent chunks are kept in memory"""
+    qm = QueueManager(max_in_memory_chunks=3)
+
+    message = await qm.enqueue("Test", thread_id="thread-1")
+
+    for chunk in "abcde":
+        await qm.add_chunk(message.id, chunk)
+
+    chunks, seq = await qm.drain_chunks(message.id)
+    assert chunks == ["c", "d", "e"]
+    assert seq == 5
+
+
+@pytest.mark.asyncio
+async def test_update_event_notifies_subscribers():
+    """Test that chunk and state updates wake waiting subscribers"""
+    qm = QueueManager()
+
+    message = await qm.enqueue("Test", thread_id="thread-1")
+    await qm.update_state(message.id, MessageState.PROCESSING)
+
+    # No update yet, so the wait times out
+    update_event = qm.get_update_event(message.id)
+    assert await qm.wait_for_update(update_event, timeout=0.01) is False
+
+    await qm.add_chunk(message.id, "chunk1")
+    assert await qm.wait_for_update(update_event, timeout=0.01) is True
+
+    # Terminal state releases waiters and stops issuing new events
+    update_event = qm.get_update_event(message.id)
+    await qm.update_state(message.id, MessageState.COMPLETED)
+    assert update_event.is_set()
+    assert qm.get_update_event(message.id) is None
+
+
+@pytest.mark.asyncio
+async def test_chunk_updates_coalesce_per_loop_iteration():
+    """Test that a burst of chunks wakes subscribers once"""
+    qm = QueueManager()
+
+    message = await qm.enqueue("Test", thread_id="thread-1")
+    await qm.update_state(message.id, MessageState.PROCESSING)
+
+    update_event = qm.get_update_event(message.id)
+    for chunk in ["a", "b", "c"]:
+        await qm.add_chunk(message.id, chunk)
+
+    # Chunks are readable at once, the wake-up lands on the next iteration
+    assert message.chunk_seq == 3
+    assert not update_event.is_set()
+
+    await asyncio.sleep(0)
+    assert update_event.is_set()
+
+    # The whole burst consumed a single event
+    next_event = qm.get_update_event(message.id)
+    await asyncio.sleep(0)
+    assert not next_event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_subscriber_tracking():
+    """Test counting streaming subscribers per message"""
+    qm = QueueManager()
+
+    message = await qm.enqueue("Test", thread_id="thread-1")
+    assert qm.has_subscribers(message.id) is False
+
+    qm.subscribe(message.id)
+    qm.subscribe(message.id)
+    assert qm.has_subscribers(message.id) is True
+
+    qm.unsubscribe(message.id)
+    assert qm.has_subscribers(message.id) is True
+
+    qm.unsubscribe(message.id)
+    assert qm.has_subscribers(message.id) is False
+
+
+@pytest.mark.asyncio
+async def test_finished_message_releases_chunks_after_last_subscriber():
+    """Test that chunks are dropped once a finished message has no readers"""
+    qm = QueueManager()
+
+    message = await qm.enqueue("Test", thread_id="thread-1")
+    await qm.update_state(message.id, MessageState.PROCESSING)
+    qm.subscribe(message.id)
+    await qm.add_chunk(message.id, "a")
+    await qm.add_chunk(message.id, "b")
+    await qm.complete(message.id, "ab")
+
+    # A connected stream can still drain the tail after completion
+    chunks, _ = await qm.drain_chunks(message.id)
+    assert chunks == ["a", "b"]
+
+    qm.unsubscribe(message.id)
+    assert message.chunks is None
+    assert message.result == "ab"
+
+    # Without a subscriber the chunks are released as soon as the message finishes
+    other = await qm.enqueue("Other", thread_id="thread-1")
+    await qm.update_state(other.id, MessageState.PROCESSING)
+    await qm.add_chunk(other.id, "c")
+    await qm.complete(other.id, "c")
+    assert other.chunks is None
+
+
+@pytest.mark.asyncio
+async def test_get_queue_positions_matches_single_lookup():
+    """Test batched queue positions agree with per-message lookups"""
+    qm = QueueManager()
+
+    low = await qm.enqueue("Low", thread_id="thread-1", priority=Priority.LOW)
+    normal = await qm.enqueue("Normal", thread_id="thread-2", priority=Priority.NORMAL)
+    high = await qm.enqueue("High", thread_id="thread-3", priority=Priority.HIGH)
+    processing = await qm.enqueue("Busy", thread_id="thread-4")
+    await qm.update_state(processing.id, MessageState.PROCESSING)
+
+    ids = [low.id, normal.id, high.id, processing.id, "missing"]
+    positions = await qm.get_queue_positions(ids)
+
+    assert positions == {
+        message_id: await qm.get_queue_position(message_id) for message_id in ids
+    }
+    assert positions[high.id] == 0
+    assert positions[low.id] == 2
+    assert positions[processing.id] is None
+
+
+@pytest.mark.asyncio
+async def test_queue_position_shifts_when_message_leaves_queue():
+    """Test cached queue positions are refreshed after cancel and dequeue"""
+    qm = QueueManager()
+
+    first = await qm.enqueue("First", thread_id="thread-1")
+    second = await qm.enqueue("Second", thread_id="thread-2")
+    third = await qm.enqueue("Third", thread_id="thread-3")
+
+    assert await qm.get_queue_position(third.id) == 2
+
+    await qm.cancel_message(first.id)
+    assert await qm.get_queue_position(third.id) == 1
+
+    await qm.dequeue("thread-2")
+    assert await qm.get_queue_position(second.id) is None
+    assert await qm.get_queue_position(third.id) == 0
+
+
 @pytest.mark.asyncio
 async def test_get_queue_summary():
     """Test getting queue summary"""
@@ -227,6 +462,7 @@ async def test_get_queue_summary():
     assert summary.total_processing == 1
     assert summary.total_completed == 1
     assert len(summary.queued_messages) == 2
+    assert summary.current_processing["id"] == msg3.id
 
 
 @pytest.mark.asyncio
@@ -242,14 +478,14 @@ async def test_dequeue_skips_cancelled():
     # Cancel first message
     await qm.cancel_message(msg1.id)
 
-    # Dequeue should skip cancelled and return None (since cancelled is skipped)
-    dequeued1 = await qm.dequeue(thread_id)
-    assert dequeued1 is None  # First dequeue gets the cancelled message and returns None
-    
-    # Second dequeue should return the second message
-    dequeued2 = await qm.dequeue(thread_id)
-    assert dequeued2 is not None
-    assert dequeued2.id == msg2.id
+    # Dequeue should skip the cancelled message and return the next one
+    dequeued = await qm.dequeue(thread_id)
+    assert dequeued is not None
+    assert dequeued.id == msg2.id
+
+    # Nothing left to dequeue
+    assert await qm.dequeue(thread_id) is None
+    assert not qm.has_messages(thread_id)
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,43 @@
+from shinzo.agent.cache import ResponseCache, make_cache_key
+
+
+def test_response_cache_matches_identical_conversations():
+    """Test that only an identical model, prompt and history hit the cache"""
+    cache = ResponseCache(max_entries=10)
+    history = [("user", "hi"), ("assistant", "hello"), ("user", "how are you?")]
+
+    cache.put(make_cache_key("model", None, history), "fine")
+
+    assert cache.get(make_cache_key("model", None, list(history))) == "fine"
+    assert cache.get(make_cache_key("other-model", None, history)) is None
+    assert cache.get(make_cache_key("model", "Be terse.", history)) is None
+    assert cache.get(make_cache_key("model", None, history[:1])) is None
+
+
+def test_response_cache_evicts_least_recently_used():
+    """Test that the oldest untouched entry is dropped when the cache is full"""
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_response_cache_expires_entries_after_ttl(monkeypatch):
+    """Test that entries older than the TTL are treated as misses and dropped"""
+    now = 1000.0
+    monkeypatch.setattr("shinzo.agent.cache.time.monotonic", lambda: now)
+    cache = ResponseCache(max_entries=10, ttl_seconds=300)
+    cache.put("a", "1")
+
+    now += 299
+    assert cache.get("a") == "1"
+
+    now += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
@@ -49,6 +49,7 @@ async def test_thread_metadata_updates_on_state_change():
     assert metadata.states[MessageState.QUEUED] == 0
     assert metadata.states[MessageState.PROCESSING] == 0
     assert metadata.states[MessageState.COMPLETED] == 1
+    assert metadata.last_activity == message.completed_at
 
 
 @pytest.mark.asyncio
@@ -81,6 +82,50 @@ async def test_list_threads_sorted_by_activity():
     assert summaries[1].thread_id == first_thread
 
 
+@pytest.mark.asyncio
+async def test_list_threads_follows_latest_activity():
+    qm = QueueManager()
+
+    first = await qm.enqueue("Hello", thread_id="thread-one")
+    await qm.enqueue("Hi", thread_id="thread-two")
+    await qm.enqueue("Hey", thread_id="thread-three")
+
+    # Activity on the oldest thread moves it back to the top
+    await qm.cancel_message(first.id)
+
+    summaries = await qm.list_threads()
+    assert [summary.thread_id for summary in summaries] == [
+        "thread-one",
+        "thread-three",
+        "thread-two",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_threads_previews_latest_message():
+    qm = QueueManager(message_retention_seconds=0.01)
+    thread_id = "thread-preview"
+
+    await qm.enqueue("First", thread_id=thread_id)
+    second = await qm.enqueue("Second " + "x" * 200, thread_id=thread_id)
+
+    metadata = await qm.get_thread_metadata(thread_id)
+    assert metadata.last_message_id == second.id
+
+    [summary] = await qm.list_threads()
+    assert summary.last_message_preview == ("Second " + "x" * 200)[:97] + "..."
+
+    # Evicting the latest message moves the preview back to the newest one retained
+    await qm.cancel_message(second.id)
+    await asyncio.sleep(0.02)
+    await qm.enqueue("Elsewhere", thread_id="thread-other")
+
+    summaries = {s.thread_id: s for s in await qm.list_threads()}
+    assert summaries[thread_id].last_message_preview == "First"
+    metadata = await qm.get_thread_metadata(thread_id)
+    assert metadata.last_message_id != second.id
+
+
 @pytest.mark.asyncio
 async def test_thread_messages_handle_missing_entries():
     qm = QueueManager()
@@ -89,13 +134,27 @@ async def test_thread_messages_handle_missing_entries():
     message = await qm.enqueue("To be deleted", thread_id=thread_id)
 
     # Simulate message removal
-    async with qm._lock:  # type: ignore[attr-defined]
-        del qm._messages[message.id]  # type: ignore[attr-defined]
+    del qm._messages[message.id]  # type: ignore[attr-defined]
 
     messages = await qm.get_thread_messages(thread_id)
     assert messages == []
 
 
+@pytest.mark.asyncio
+async def test_thread_messages_pagination():
+    qm = QueueManager()
+    thread_id = "thread-pages"
+
+    for index in range(5):
+        await qm.enqueue(f"Message {index}", thread_id=thread_id)
+
+    page = await qm.get_thread_messages(thread_id, limit=2, offset=1)
+    assert [msg.user_message for msg in page] == ["Message 1", "Message 2"]
+
+    rest = await qm.get_thread_messages(thread_id, offset=3)
+    assert [msg.user_message for msg in rest] == ["Message 3", "Message 4"]
+
+
 @pytest.mark.asyncio
 async def test_cancelling_threaded_message_updates_states():
     qm = QueueManager()
@@ -129,3 +188,156 @@ async def test_thread_scaling_handles_many_threads():
     messages = await qm.get_thread_messages(sample_thread)
     assert len(messages) == 10
 
+
+@pytest.mark.asyncio
+async def test_next_ready_thread_reports_idle_threads_once():
+    qm = QueueManager()
+
+    # Threads that became ready before anyone waits must not be missed
+    await qm.enqueue("First", thread_id="thread-a")
+    await qm.enqueue("Second", thread_id="thread-a")
+    await qm.enqueue("Third", thread_id="thread-b")
+
+    assert await asyncio.wait_for(qm.next_ready_thread(), timeout=1) == "thread-a"
+    assert await asyncio.wait_for(qm.next_ready_thread(), timeout=1) == "thread-b"
+
+    # The second message joined a non-empty queue, so it adds no wake-up
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(qm.next_ready_thread(), timeout=0.05)
+
+    # Once drained, the next message makes the thread ready again
+    await qm.dequeue("thread-b")
+    await qm.enqueue("Fourth", thread_id="thread-b")
+    assert await asyncio.wait_for(qm.next_ready_thread(), timeout=1) == "thread-b"
+
+
+@pytest.mark.asyncio
+async def test_finished_messages_evicted_after_retention():
+    qm = QueueManager(message_retention_seconds=0.01)
+    thread_id = "thread-retention"
+
+    old = await qm.enqueue("Old", thread_id=thread_id)
+    await qm.update_state(old.id, MessageState.PROCESSING)
+    await qm.update_state(old.id, MessageState.COMPLETED)
+
+    await asyncio.sleep(0.02)
+
+    # Eviction runs lazily on the next enqueue
+    new = await qm.enqueue("New", thread_id=thread_id)
+
+    assert await qm.get_message(old.id) is None
+    assert [m.id for m in await qm.get_thread_messages(thread_id)] == [new.id]
+
+    metadata = await qm.get_thread_metadata(thread_id)
+    assert metadata.message_count == 1
+    assert metadata.states[MessageState.COMPLETED] == 0
+
+    summary = await qm.get_queue_summary()
+    assert summary.total_completed == 0
+    assert summary.total_queued == 1
+
+
+@pytest.mark.asyncio
+async def test_thread_removed_when_last_message_expires():
+    qm = QueueManager(message_retention_seconds=0.01)
+
+    old = await qm.enqueue("Old", thread_id="thread-expired")
+    await qm.update_state(old.id, MessageState.PROCESSING)
+    await qm.update_state(old.id, MessageState.COMPLETED)
+
+    await asyncio.sleep(0.02)
+    await qm.enqueue("New", thread_id="thread-other")
+
+    assert await qm.get_thread_metadata("thread-expired") is None
+    assert [summary.thread_id for summary in await qm.list_threads()] == ["thread-other"]
+    assert "thread-expired" not in qm._thread_queues  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_finished_messages_capped_by_count():
+    qm = QueueManager(message_retention_seconds=0, max_finished_messages=2)
+    thread_id = "thread-cap"
+
+    finished = []
+    for text in ["One", "Two", "Three"]:
+        message = await qm.enqueue(text, thread_id=thread_id)
+        await qm.cancel_message(message.id)
+        finished.append(message)
+
+    # Eviction runs lazily on the next enqueue, oldest first
+    await qm.enqueue("Four", thread_id=thread_id)
+
+    assert await qm.get_message(finished[0].id) is None
+    assert await qm.get_message(finished[1].id) is not None
+
+    summary = await qm.get_queue_summary()
+    assert summary.total_cancelled == 2
+
+
+@pytest.mark.asyncio
+async def test_thread_removed_when_capped_out():
+    qm = QueueManager(message_retention_seconds=0, max_finished_messages=1)
+
+    only = await qm.enqueue("Only", thread_id="thread-capped")
+    await qm.cancel_message(only.id)
+    other = await qm.enqueue("Other", thread_id="thread-other")
+    await qm.cancel_message(other.id)
+
+    # The next enqueue evicts the oldest finished message past the cap
+    await qm.enqueue("Next", thread_id="thread-other")
+
+    assert await qm.get_message(only.id) is None
+    assert await qm.get_thread_metadata("thread-capped") is None
+    assert [summary.thread_id for summary in await qm.list_threads()] == ["thread-other"]
+
+
+@pytest.mark.asyncio
+async def test_conversation_history_caches_finished_turns():
+    qm = QueueManager(message_retention_seconds=0.01)
+    thread_id = "thread-history"
+
+    first = await qm.enqueue("Hi", thread_id=thread_id)
+    await qm.update_state(first.id, MessageState.PROCESSING)
+    await qm.complete(first.id, "Hello!")
+    current = await qm.enqueue("How are you?", thread_id=thread_id)
+    await qm.update_state(current.id, MessageState.PROCESSING)
+    later = await qm.enqueue("Still there?", thread_id=thread_id)
+
+    history = await qm.get_conversation_history(thread_id, exclude_message_id=current.id)
+    assert history == [("user", "Hi"), ("assistant", "Hello!"), ("user", "Still there?")]
+
+    # The finished first message is cached; live messages are read fresh
+    cached = qm._thread_histories[thread_id]  # type: ignore[attr-defined]
+    assert cached.message_count == 1
+
+    await qm.complete(current.id, "Fine")
+    history = await qm.get_conversation_history(thread_id, exclude_message_id=later.id)
+    assert history == [
+        ("user", "Hi"),
+        ("assistant", "Hello!"),
+        ("user", "How are you?"),
+        ("assistant", "Fine"),
+    ]
+    assert cached.message_count == 2
+
+    # Evicting a message drops the cache so positions are rebuilt
+    await asyncio.sleep(0.02)
+    await qm.enqueue("New", thread_id=thread_id)
+    history = await qm.get_conversation_history(thread_id, exclude_message_id=later.id)
+    assert history == [("user", "New")]
+
+
+@pytest.mark.asyncio
+async def test_thread_metadata_is_a_copy():
+    qm = QueueManager()
+    thread_id = "thread-copy"
+
+    await qm.enqueue("Hello", thread_id=thread_id)
+
+    metadata = await qm.get_thread_metadata(thread_id)
+    metadata.states[MessageState.QUEUED] = 99
+    metadata.message_count = 99
+
+    fresh = await qm.get_thread_metadata(thread_id)
+    assert fresh.states[MessageState.QUEUED] == 1
+    assert fresh.message_count == 1
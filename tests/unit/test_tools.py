@@ -0,0 +1,29 @@
+from unittest import mock
+
+from shinzo import tools
+
+
+def test_get_company_info_reuses_recent_lookups():
+    """Test that repeated lookups of a ticker are served from the cache"""
+    tools._company_info_cache.clear()
+    ticker = mock.Mock(info={"longName": "Apple Inc.", "sector": "Technology"})
+
+    with mock.patch.object(tools.yf, "Ticker", return_value=ticker) as fetch:
+        first = tools.get_company_info.invoke({"ticker": "aapl"})
+        second = tools.get_company_info.invoke({"ticker": "AAPL"})
+
+    assert fetch.call_count == 1
+    assert second == first
+    assert first["name"] == "Apple Inc."
+
+
+def test_get_company_info_does_not_cache_errors():
+    """Test that failed lookups are retried on the next call"""
+    tools._company_info_cache.clear()
+
+    with mock.patch.object(tools.yf, "Ticker", side_effect=RuntimeError("offline")) as fetch:
+        tools.get_company_info.invoke({"ticker": "MSFT"})
+        result = tools.get_company_info.invoke({"ticker": "MSFT"})
+
+    assert fetch.call_count == 2
+    assert "error" in result